@@ -0,0 +1,4 @@
+"""
+Offline microbenchmarks of the bot hot paths, run them from the repository root :
+    python -m benchmarks [--filter tag] [--output results.json] [--compare previous.json]
+"""
@@ -0,0 +1,43 @@
+import argparse
+import importlib
+import json
+import os
+
+from .bench import BENCHMARKS, measure, metadata, compare, save
+
+MODULES = ['bench_tags', 'bench_tag_model', 'bench_codec', 'bench_regex', 'bench_codeblock', 'bench_language', 'bench_i18n', 'bench_event']
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks')
+parser.add_argument('--filter', default='', help='Only run the benchmarks whose name contains this text.')
+parser.add_argument('--output', default=None, help='Where to write the results (JSON), benchmarks/results/<commit>.json by default.')
+parser.add_argument('--compare', default=None, help='Previous results (JSON) to compare with.')
+args = parser.parse_args()
+
+skipped = {}
+for module in MODULES:
+    try:
+        importlib.import_module(f'benchmarks.{module}')
+    except ImportError as e:  # a dependency of the bot is missing
+        skipped[module] = str(e)
+
+results = {'meta': metadata(), 'results': {}, 'skipped': skipped}
+print(f"{'benchmark':<55}{'median us':>12}{'min us':>12}")
+for name, setup in BENCHMARKS.items():
+    if args.filter not in name:
+        continue
+    result = results['results'][name] = measure(setup())
+    print(f"{name:<55}{result['median_us']:>12.2f}{result['min_us']:>12.2f}")
+
+for module, error in skipped.items():
+    print(f'skipped {module} : {error}')
+
+output = args.output or os.path.join('benchmarks', 'results', f"{results['meta']['commit'] or 'results'}.json")
+os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+save(results, output)
+print(f'results written to {output}')
+
+if args.compare:
+    with open(args.compare, encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\n{'benchmark':<55}{'before us':>12}{'after us':>12}{'ratio':>9}")
+    print('\n'.join(compare(results, previous)))
@@ -0,0 +1,74 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+BENCHMARKS = {}  # {name: setup function returning the function to time}
+
+
+def benchmark(name: str):
+    """Register a setup function, it is called once and returns the zero-argument function to time."""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def measure(function, repeat: int = 7, min_time: float = 0.05) -> dict:
+    """Time function like timeit : calibrate the number of calls per run, then keep the statistics of `repeat` runs."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for __ in range(number):
+            function()
+        if (elapsed := time.perf_counter() - start) >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    timings = []
+    for __ in range(repeat):
+        start = time.perf_counter()
+        for __ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'number': number,
+        'min_us': min(timings) * 1e6,
+        'median_us': statistics.median(timings) * 1e6,
+        'mean_us': statistics.mean(timings) * 1e6,
+        'stdev_us': statistics.stdev(timings) * 1e6 if len(timings) > 1 else 0.0
+    }
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        'date': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform()
+    }
+
+
+def compare(results: dict, previous: dict, threshold: float = 0.1) -> list:
+    """Return the lines comparing the median times, a regression is slower than previous by more than threshold."""
+    lines = []
+    for name, result in results['results'].items():
+        if not (old := previous['results'].get(name)):
+            continue
+        ratio = result['median_us'] / old['median_us']
+        flag = 'REGRESSION' if ratio > 1 + threshold else 'improvement' if ratio < 1 - threshold else ''
+        lines.append(f"{name:<55}{old['median_us']:>12.2f}{result['median_us']:>12.2f}{ratio:>8.2f}x  {flag}")
+    return lines
+
+
+def save(results: dict, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,62 @@
+"""The code block parsers of /lines and /event participate, against the former regexes, on valid and adversarial inputs."""
+import re
+
+from cogs.utils.codeblock import find_code_block, find_participation, number_lines
+
+from .bench import benchmark
+
+# the patterns replaced by cogs.utils.codeblock, kept for the comparisons (see also fuzz_codeblock)
+LEGACY_CODE_BLOCK = re.compile(r'```(?:(\S*)\n)?(\s*\S[\S\s]*)```')
+LEGACY_PARTICIPATION = re.compile(r'(```)?(?:(\S*)\s)(\s*\S[\S\s]*)(?(1)```|)')
+
+CODE = 'const client = new Discord.Client();\nclient.on("ready", () => console.log(`Logged in as ${client.user.tag}!`));\n'
+
+INPUTS = {
+    'valid block [2000 chars]': '/lines ```js\n' + (CODE * 20)[:1970] + '```',
+    'unterminated block [4000 chars]': '/lines ```js\n' + (CODE * 40)[:3980],
+    'many fences [2000 chars]': '/lines ' + '``` a\n' * 330,  # every fence opens a new attempt
+    'unterminated backticks [4000 chars]': '```' + '`a ' * 1330,
+}
+
+
+def legacy_number_lines(code: str) -> str:
+    numbered_code = '\n'.join(f'{i:>3} | {line}' for i, line in enumerate(code.splitlines()))
+    if len(numbered_code) > 1950:
+        numbered_code = numbered_code[:1950] + '\netc...'
+    return numbered_code
+
+
+def register(label, content):
+    participation = content[len('/lines '):] if content.startswith('/lines ') else content
+
+    @benchmark(f'/lines legacy regex {label}')
+    def setup():
+        return lambda: LEGACY_CODE_BLOCK.search(content)
+
+    @benchmark(f'/lines parser {label}')
+    def setup():
+        return lambda: find_code_block(content)
+
+    @benchmark(f'participate legacy regex {label}')
+    def setup():
+        return lambda: LEGACY_PARTICIPATION.search(participation)
+
+    @benchmark(f'participate parser {label}')
+    def setup():
+        return lambda: find_participation(participation)
+
+
+for label, content in INPUTS.items():
+    register(label, content)
+
+
+@benchmark('/lines legacy numbering [100 KB]')
+def setup():
+    code = (CODE * 1000)[:100_000]
+    return lambda: legacy_number_lines(code)
+
+
+@benchmark('/lines numbering with budget [100 KB]')
+def setup():
+    code = (CODE * 1000)[:100_000]
+    return lambda: number_lines(code)
@@ -0,0 +1,49 @@
+"""JSON decoding (cogs/utils/codec.py) of the tag files and of API responses (benchmarks/payloads), stdlib against orjson."""
+import json
+import os
+
+from cogs.utils import codec
+
+from .bench import benchmark
+
+TAGS_FOLDER = 'ressources/tags/'
+PAYLOADS_FOLDER = os.path.join(os.path.dirname(__file__), 'payloads')  # Piston and GitHub responses, for the shapes and sizes
+
+
+def read_bytes(folder: str) -> list:
+    contents = []
+    for root, __, files in sorted(os.walk(folder)):
+        for file_name in sorted(files):
+            if file_name.endswith('.json'):
+                with open(os.path.join(root, file_name), 'rb') as f:
+                    contents.append((file_name, f.read()))
+    return contents
+
+
+DECODERS = {
+    'json.loads(bytes.decode())': lambda content: json.loads(content.decode()),  # response.json() / response.text()
+    'json.loads(bytes)': json.loads
+}
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    DECODERS['orjson.loads(bytes)'] = orjson.loads
+
+for decoder_name, decode in DECODERS.items():
+    @benchmark(f'decode every tag [{decoder_name}]')
+    def setup(decode=decode):
+        contents = [content for __, content in read_bytes(TAGS_FOLDER)]
+        return lambda: [decode(content) for content in contents]
+
+    for payload_name, payload in read_bytes(PAYLOADS_FOLDER):
+        @benchmark(f'decode {payload_name} [{decoder_name}]')
+        def setup(decode=decode, payload=payload):
+            return lambda: decode(payload)
+
+
+@benchmark(f'encode piston_execute.json [codec.dumps, {codec.BACKEND}]')
+def setup():
+    data = json.loads(dict(read_bytes(PAYLOADS_FOLDER))['piston_execute.json'])
+    return lambda: codec.dumps(data)
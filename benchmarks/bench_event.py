@@ -0,0 +1,56 @@
+"""Event.crawl_participations (the channel history is faked), get_participations from its snapshot, and the rankings of /event stats."""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from cogs.event import Event
+
+from .bench import benchmark
+
+LANGUAGES = ['python', 'javascript', 'c++', 'rust', 'go', 'java', 'ruby', 'php']
+
+
+def fake_participations(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2021, 4, 1)
+    messages = []
+    for i in range(count):
+        fields = [SimpleNamespace(value=f'{i}|<@{i}>'), SimpleNamespace(value=rng.choice(LANGUAGES)),
+                  SimpleNamespace(value=str(rng.randint(20, 1000))), SimpleNamespace(value=(start + timedelta(minutes=i)).isoformat())]
+        messages.append(SimpleNamespace(id=i, author=SimpleNamespace(id=0), embeds=[SimpleNamespace(title='Participation :', fields=fields)]))
+    return messages
+
+
+def fake_event(messages):
+    async def history(limit=None, after=None):
+        for message in messages:
+            yield message
+
+    users = {i: SimpleNamespace(id=i) for i in range(len(messages))}
+    bot = SimpleNamespace(user=SimpleNamespace(id=0), get_user=users.get, get_channel=lambda __: SimpleNamespace(history=history), loop=None)
+    return SimpleNamespace(bot=bot, code_channel_id=0, get_informations=lambda: {'date': None},
+                           participations_snapshot=None, participations_scan=None)
+
+
+for count in (10, 100, 1000):
+    @benchmark(f'event.crawl_participations [{count} participations]')
+    def setup(count=count):
+        event = fake_event(fake_participations(count))
+        loop = asyncio.new_event_loop()
+        return lambda: loop.run_until_complete(Event.crawl_participations(event))
+
+    @benchmark(f'event.get_participations from the snapshot [{count} participations]')
+    def setup(count=count):
+        event = fake_event(fake_participations(count))
+        loop = asyncio.new_event_loop()
+        event.participations_snapshot = (float('inf'), *loop.run_until_complete(Event.crawl_participations(event)))  # always fresh
+        user = SimpleNamespace(id=count // 2)
+        return lambda: loop.run_until_complete(Event.get_participations(event, user))
+
+    @benchmark(f'event.get_ranking of every participation [{count} participations]')
+    def setup(count=count):
+        loop = asyncio.new_event_loop()
+        __, datas, datas_global = loop.run_until_complete(Event.crawl_participations(fake_event(fake_participations(count))))
+        infos = [(language, data) for language, language_datas in datas.items() for data in language_datas]
+        return lambda: [Event.get_ranking(datas, datas_global, language, data) for language, data in infos]
@@ -0,0 +1,26 @@
+"""i18n.use_current_gettext, called for every translated text."""
+from cogs.utils import i18n
+
+from .bench import benchmark
+
+MESSAGE = "Tag not found, {0}look `/tag list`"
+
+for locale in ('en_US', 'fr_FR', 'de_DE'):
+    @benchmark(f'i18n.use_current_gettext [{locale}]')
+    def setup(locale=locale):
+        i18n.current_locale.set(locale)
+        return lambda: i18n.use_current_gettext(MESSAGE)
+
+
+@benchmark('i18n.LazyString formatted [fr_FR]')
+def setup():
+    i18n.current_locale.set('fr_FR')
+    message = i18n.lazy_gettext(MESSAGE)
+    return lambda: message.format('')
+
+
+@benchmark('i18n.render_cached help listing [fr_FR]')
+def setup():
+    i18n.current_locale.set('fr_FR')
+    descriptions = [i18n.lazy_gettext(MESSAGE) for __ in range(10)]
+    return lambda: i18n.render_cached('bench help', lambda: '\n'.join(f'`/command` : {description}' for description in descriptions))
@@ -0,0 +1,31 @@
+"""HelpCenterBot.get_user_language, called by every command and tag lookup."""
+from types import SimpleNamespace
+
+from bot import HelpCenterBot
+from cogs.utils.guild_config import GuildConfig
+
+from .bench import benchmark
+
+BUG_CENTER_ID = 595218682670481418
+
+
+def fake_bot():
+    config = GuildConfig(BUG_CENTER_ID, language_roles=[(797581355785125889, 'fr_FR'), (797581356749946930, 'en_EN')])
+    bot = SimpleNamespace(bug_center_id=BUG_CENTER_ID, guild_configs={BUG_CENTER_ID: config})
+    bot.get_bug_center_member = lambda user_id: None
+    return bot
+
+
+for roles in (1, 10, 50, 250):
+    @benchmark(f'get_user_language [{roles} roles, no language role]')
+    def setup(roles=roles):
+        bot = fake_bot()
+        member = SimpleNamespace(id=1, guild=SimpleNamespace(id=BUG_CENTER_ID), roles=[SimpleNamespace(id=i) for i in range(roles)])
+        return lambda: HelpCenterBot.get_user_language(bot, member)
+
+    @benchmark(f'get_user_language [{roles} roles, english role last]')
+    def setup(roles=roles):
+        bot = fake_bot()
+        member = SimpleNamespace(id=1, guild=SimpleNamespace(id=BUG_CENTER_ID),
+                                 roles=[SimpleNamespace(id=i) for i in range(roles - 1)] + [SimpleNamespace(id=797581356749946930)])
+        return lambda: HelpCenterBot.get_user_language(bot, member)
@@ -0,0 +1,26 @@
+"""The token scan of every message, on large inputs."""
+from cogs.utils.jobs import RE_TOKEN
+
+from .bench import benchmark
+
+PROSE = 'Hello, I have a problem with my bot. It says: TypeError: cannot read property of undefined. Any idea? '
+CODE = 'const client = new Discord.Client();\nclient.on("ready", () => console.log(`Logged in as ${client.user.tag}!`));\n'
+
+
+@benchmark('re_token message without token [2000 chars]')
+def setup():
+    content = (PROSE * 30)[:2000]
+    return lambda: RE_TOKEN.search(content)
+
+
+@benchmark('re_token attachment without token [100 KB]')
+def setup():
+    content = (CODE * 1000)[:100_000]
+    return lambda: RE_TOKEN.search(content)
+
+
+@benchmark('re_token dotted words without token [2000 chars]')
+def setup():
+    content = ('module.submodule.attr ' * 100)[:2000]  # matches the pattern shape, worst case for the scan
+    return lambda: RE_TOKEN.findall(content)
+
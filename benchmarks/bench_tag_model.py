@@ -0,0 +1,97 @@
+"""
+Tag loading : the compiled model (cogs/utils/tag_model.py) against the former schema validation + complete_values.
+    python -m benchmarks.bench_tag_model [--copies 50]  # load time and memory of the tags folder, copied `copies` times
+
+The former path needs the schema package, it is skipped when it is not installed.
+"""
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+from cogs.utils.tag_model import Tag, complete_values
+
+from .bench import benchmark
+
+TAGS_FOLDER = 'ressources/tags/'
+
+try:
+    from schema import Schema, Or, And, Use, Optional, Regex
+except ImportError:
+    legacy_tag_schema = None
+else:  # the schemas replaced by tag_model, kept for the comparisons
+    text_or_list = Schema(Or(str, And(list, Use(lambda iterable: '\n'.join(iterable)))))
+    embed_schema = Schema({
+        'title': str,
+        'description': text_or_list,
+        Optional('image'): {'url': str},
+        Optional('fields'): [{'name': str, 'value': text_or_list, Optional('inline'): bool}]
+    })
+    inner_tag_schema = Schema({
+        Optional('lang'): Regex(r'[a-z]{2}_[A-Z]{2}'),
+        'name': str,
+        Optional('aliases'): list,
+        'description': str,
+        'response': Or({'embed': embed_schema}, {'choices': [{'choice_name': str, 'embed': embed_schema}]})
+    })
+    legacy_tag_schema = Schema(Or([inner_tag_schema], inner_tag_schema))
+
+
+def legacy_load(data):
+    return complete_values(legacy_tag_schema.validate(data))
+
+
+def read_tags() -> list:
+    """The content of every tag file."""
+    tags = []
+    for category in sorted(os.listdir(TAGS_FOLDER)):
+        category_path = os.path.join(TAGS_FOLDER, category)
+        for tag_name in sorted(os.listdir(category_path)):
+            with open(os.path.join(category_path, tag_name), encoding='utf-8') as f:
+                tags.append(f.read())
+    return tags
+
+
+LOADERS = {'tag_model': Tag.from_json}
+if legacy_tag_schema is not None:
+    LOADERS['schema + complete_values'] = legacy_load
+
+for name, load in LOADERS.items():
+    @benchmark(f'load every tag [{name}]')
+    def setup(load=load):
+        tags = read_tags()
+        return lambda: [load(json.loads(text)) for text in tags]
+
+
+def measure_memory(load, tags: list, copies: int) -> (float, int):
+    """Return (load time in seconds, bytes still allocated by the loaded tags), the JSON parsing included."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    loaded = [[load(json.loads(text)) for text in tags] for __ in range(copies)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del loaded
+    return elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--copies', type=int, default=50, help='how many times the tags folder is loaded')
+    args = parser.parse_args()
+
+    tags = read_tags()
+    if legacy_tag_schema is None:
+        print('schema is not installed, the former path is skipped')
+    print(f"{'loader':<28}{'load ms':>10}{'memory KiB':>14}  ({len(tags) * args.copies} tags)")
+    for name, load in LOADERS.items():
+        elapsed, size = measure_memory(load, tags, args.copies)
+        print(f'{name:<28}{elapsed * 1000:>10.1f}{size / 1024:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Tag lookups (cogs/utils/tag_index.py) on synthetic corpora of increasing size."""
+import random
+import string
+
+from cogs.utils.tag_index import TagIndex
+from cogs.utils.tag_model import Tag, Variant, Embed
+
+from .bench import benchmark
+
+SIZES = (10, 100, 1000)
+
+
+def random_name(rng, length=8):
+    return ''.join(rng.choice(string.ascii_lowercase) for __ in range(length))
+
+
+def synthetic_tags(size, categories=5, seed=0) -> dict:
+    """{category: {tag name: Tag(french variant, english variant)}}, with 2 aliases per variant."""
+    rng = random.Random(seed)
+    tags = {}
+    for __ in range(categories):
+        category = tags[random_name(rng)] = {}
+        for __ in range(size):
+            name = random_name(rng)
+            category[name] = Tag(tuple(
+                Variant(name, 'description', lang=lang, aliases=(random_name(rng), random_name(rng)), embed=Embed('title', 'description'))
+                for lang in ('fr_FR', 'en_EN')
+            ))
+    return tags
+
+
+for size in SIZES:
+    @benchmark(f'tag.find_tag exact [{size} tags]')
+    def setup(size=size):
+        index = TagIndex(synthetic_tags(size))
+        category = next(iter(index.tags))
+        query = list(index.tags[category])[-1]
+        return lambda: index.find_tag(category, query, 'en_EN')
+
+    @benchmark(f'tag.find_tag alias [{size} tags]')
+    def setup(size=size):
+        index = TagIndex(synthetic_tags(size))
+        category = next(iter(index.tags))
+        query = list(index.tags[category].values())[-1].variants[1].aliases[1]  # worst case, the last tag
+        return lambda: index.find_tag(category, query, 'en_EN')
+
+    @benchmark(f'tag.find_tag fuzzy suggestion [{size} tags]')
+    def setup(size=size):
+        index = TagIndex(synthetic_tags(size))
+        category = next(iter(index.tags))
+        query = list(index.tags[category])[size // 2][:-1] + '_'  # a typo
+        return lambda: index.find_tag(category, query, 'en_EN')
+
+    @benchmark(f'tag.find_category fuzzy [{size} tags]')
+    def setup(size=size):
+        index = TagIndex(synthetic_tags(size))
+        query = list(index.tags)[-1][:-1] + '_'
+        return lambda: index.find_category(query)
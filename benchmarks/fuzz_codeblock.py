@@ -0,0 +1,91 @@
+"""
+Differential fuzzing of cogs.utils.codeblock against the former regexes, and their worst cases :
+    python -m benchmarks.fuzz_codeblock [--iterations 100000] [--seed 0]
+"""
+import argparse
+import random
+import time
+
+from cogs.utils.codeblock import find_code_block, find_participation, number_lines
+
+from .bench_codeblock import LEGACY_CODE_BLOCK, LEGACY_PARTICIPATION, legacy_number_lines
+
+# pieces the patterns are sensitive to, random strings of them hit the edge cases quickly
+ALPHABET = ['`', '```', '````', ' ', '\n', '\t', 'py', 'x', '\r\n', '\u00a0', '\u3000']
+ADVERSARIAL = {
+    'unterminated block': lambda n: '```js\n' + 'x = 1;\n' * (n // 7),
+    'backticks and spaces': lambda n: '```' + '`a ' * (n // 3),
+    'many fences': lambda n: '``` a\n' * (n // 6),
+    'fence without space': lambda n: '```' + 'x' * n,
+    'spaces only': lambda n: '```py\n' + ' ' * n,
+}
+
+
+def random_text(rng: random.Random) -> str:
+    return ''.join(rng.choice(ALPHABET) for __ in range(rng.randint(0, 12)))
+
+
+def legacy_code_block(text):
+    match = LEGACY_CODE_BLOCK.search(text)
+    return match and (match.group(1), match.group(2))
+
+
+def legacy_participation(text):
+    match = LEGACY_PARTICIPATION.search(text)
+    return match and match.groups()[1:]
+
+
+def parsed(code_block):
+    return code_block and (code_block.language, code_block.body)
+
+
+def fuzz(iterations: int, seed: int) -> int:
+    rng = random.Random(seed)
+    failures = 0
+    for __ in range(iterations):
+        text = random_text(rng)
+        checks = [
+            ('code block', legacy_code_block(text), parsed(find_code_block(text))),
+            ('participation', legacy_participation(text), parsed(find_participation(text))),
+        ]
+        if '\r' not in text:  # splitlines() also cuts at \r, Discord sends \n
+            checks.append(('numbering', legacy_number_lines(text * 50), number_lines(text * 50)))
+
+        for name, expected, result in checks:
+            if expected != result:
+                failures += 1
+                print(f'{name} mismatch on {text!r} : expected {expected!r}, got {result!r}')
+    return failures
+
+
+def timed(function, text) -> float:
+    start = time.perf_counter()
+    function(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def worst_cases(sizes=(1000, 2000, 4000, 8000)) -> None:
+    print(f"{'input':<25}{'chars':>8}{'regex ms':>12}{'parser ms':>12}  (code block / participation)")
+    for label, make in ADVERSARIAL.items():
+        for size in sizes:
+            text = make(size)
+            print(f'{label:<25}{len(text):>8}'
+                  f'{timed(LEGACY_CODE_BLOCK.search, text):>12.2f}{timed(find_code_block, text):>12.2f}  code block')
+            print(f'{"":<25}{"":>8}'
+                  f'{timed(LEGACY_PARTICIPATION.search, text):>12.2f}{timed(find_participation, text):>12.2f}  participation')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.fuzz_codeblock')
+    parser.add_argument('--iterations', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    failures = fuzz(args.iterations, args.seed)
+    print(f'{args.iterations} random inputs, {failures} mismatches\n')
+    worst_cases()
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Full against lean member cache (MEMBER_CACHE=lean), with discord.py parsing the events like on a real connection.
+    python -m benchmarks.member_cache [--members 50000] [--active 2000] [--updates 500]
+
+Each mode runs in its own process (for the max RSS). The guild has `members` members :
+- full : they are received at startup, like the chunk requests answers (GUILD_MEMBERS_CHUNK, 1000 members each).
+- lean : nothing is received at startup.
+Then `active` members send a message, and `updates` members who didn't speak get a language role (GUILD_MEMBER_UPDATE) :
+the bot must know their new role in both modes.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from discord.state import ChunkRequest
+
+from cogs.utils import misc
+
+from .simulator import Simulator, user_payload, now
+
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK, like Discord
+
+
+def member_payload(user_id: int, roles=()) -> dict:
+    return {'user': user_payload(user_id), 'roles': [str(role_id) for role_id in roles], 'joined_at': now(), 'deaf': False, 'mute': False}
+
+
+async def drain(simulator) -> None:
+    while any(gateway.queue.qsize() for gateway in simulator.gateways):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)  # the listeners started by the last events
+
+
+async def measure(args, bot) -> dict:
+    simulator = Simulator(bot, users=args.members, reaction_rate=0, think_time=0)
+    simulator.connect()
+    guild, config = bot.get_guild(bot.bug_center_id), bot.guild_configs[bot.bug_center_id]
+    languages = list(config.language_roles)
+
+    start = time.perf_counter()
+    if not bot.lean_member_cache:  # what chunk_guilds_at_startup receives
+        request = ChunkRequest(guild.id, bot.loop, bot._connection._get_guild)
+        bot._connection._chunk_requests[request.nonce] = request
+        chunk_count = -(-args.members // CHUNK_SIZE)
+        for index in range(chunk_count):
+            members = [member_payload(user_id, [random.choice(languages)] if user_id % 2 else [])
+                       for user_id in range(index * CHUNK_SIZE + 1, min((index + 1) * CHUNK_SIZE, args.members) + 1)]
+            simulator.feed('GUILD_MEMBERS_CHUNK', {'guild_id': str(guild.id), 'members': members, 'chunk_index': index,
+                                                   'chunk_count': chunk_count, 'nonce': request.nonce})
+        await drain(simulator)
+    startup = time.perf_counter() - start
+
+    speakers = random.sample(range(1, args.members + 1), args.active)
+    updated = random.sample(sorted(set(range(1, args.members + 1)) - set(speakers)), args.updates)
+    start = time.perf_counter()
+    for user_id in speakers:
+        simulator.user_message(user_id, random.choice(config.help_channels_id), 'Hello')
+    for user_id in updated:
+        simulator.feed('GUILD_MEMBER_UPDATE', {'guild_id': str(guild.id), **member_payload(user_id, [languages[0]])})
+    await drain(simulator)
+    traffic = time.perf_counter() - start
+
+    gc.collect()
+    current_memory, __ = tracemalloc.get_traced_memory()
+    seen = sum(1 for user_id in updated if (member := bot.get_bug_center_member(user_id)) and any(role.id == languages[0] for role in member.roles))
+    return {
+        'mode': 'lean' if bot.lean_member_cache else 'full',
+        'members_cached': len(guild.members) + len(bot.member_cache),
+        'startup_ms': startup * 1000,
+        'traffic_ms': traffic * 1000,
+        'traced_memory_mb': current_memory / 1024 ** 2,
+        'max_rss_mb': misc.max_rss_mb(),
+        'role_updates_seen': f'{seen}/{len(updated)}',
+    }
+
+
+def run_mode(args) -> None:
+    os.environ['MEMBER_CACHE'] = args.mode
+    tracemalloc.start()
+    from bot import HelpCenterBot  # measured
+
+    bot = HelpCenterBot()
+    result = bot.loop.run_until_complete(measure(args, bot))
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--members', type=int, default=50_000, help='members of the guild')
+    parser.add_argument('--active', type=int, default=2_000, help='members sending a message')
+    parser.add_argument('--updates', type=int, default=500, help='members getting a language role')
+    parser.add_argument('--mode', choices=('full', 'lean'), default=None, help=argparse.SUPPRESS)  # the child processes
+    args = parser.parse_args()
+    if args.mode:
+        return run_mode(args)
+
+    columns = ('mode', 'members_cached', 'startup_ms', 'traffic_ms', 'traced_memory_mb', 'max_rss_mb', 'role_updates_seen')
+    print(''.join(f'{column:>18}' for column in columns))
+    for mode in ('full', 'lean'):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.member_cache', '--mode', mode, '--members', str(args.members),
+                                 '--active', str(args.active), '--updates', str(args.updates)],
+                                check=True, stdout=subprocess.PIPE, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(''.join(f'{result[column]:>18.1f}' if isinstance(result[column], float) else f'{result[column]!s:>18}' for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Time to full menu : the old sequential add_reaction loops against the ReactionSeeder.
+    python -m benchmarks.reaction_seeding [--menus 4] [--emojis 5] [--rtt 80] [--reset 250] [--answer-after 0.6]
+
+The REST API is modeled like discord.py 1.6 sees it : a lock per bucket (the reactions of a channel), held during the
+request and, when the bucket is exhausted, until it resets (1 reaction per `reset` ms).
+Several menus are opened at the same time in the same channel, their users answer after `answer-after` seconds.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from cogs.utils.reaction_seeder import ReactionSeeder
+
+
+class FakeHTTP:
+    def __init__(self, loop, rtt: float, reset: float):
+        self.loop = loop
+        self.rtt = rtt
+        self.reset = reset
+        self.locks = {}
+        self.requests = 0
+
+    async def add_reaction(self, channel_id, message_id, emoji) -> None:
+        lock = self.locks.setdefault(channel_id, asyncio.Lock())
+        await lock.acquire()
+        start = time.perf_counter()
+        self.requests += 1
+        await asyncio.sleep(self.rtt)
+        # remaining == 0 : discord.py keeps the lock until the bucket resets
+        self.loop.call_later(max(self.reset - (time.perf_counter() - start), 0), lock.release)
+
+
+def make_messages(count: int):
+    channel = SimpleNamespace(id=1)
+    return [SimpleNamespace(id=i, channel=channel) for i in range(count)]
+
+
+async def run_sequential(http, messages, emojis, answer_after):
+    """The previous code : one task per menu, `await message.add_reaction` in a loop, cancelled when answered."""
+    full = {}
+    start = time.perf_counter()
+
+    async def add_reactions(message):
+        for emoji in emojis:
+            await http.add_reaction(message.channel.id, message.id, emoji)
+        full[message.id] = time.perf_counter() - start
+
+    tasks = [asyncio.ensure_future(add_reactions(message)) for message in messages]
+    await asyncio.sleep(answer_after)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return full
+
+
+async def run_seeder(http, messages, emojis, answer_after):
+    bot = SimpleNamespace(loop=asyncio.get_event_loop(), http=http)
+    seeder = ReactionSeeder(bot)
+    full = {}
+    start = time.perf_counter()
+
+    seedings = [seeder.seed(message, emojis) for message in messages]
+    deadline = start + answer_after
+    while time.perf_counter() < deadline:
+        for seeding in seedings:
+            if seeding.message.id not in full and seeding.added == len(emojis):
+                full[seeding.message.id] = time.perf_counter() - start
+        await asyncio.sleep(0.001)
+    for seeding in seedings:
+        seeding.cancel()
+    while seeder.workers:
+        await asyncio.sleep(0.01)
+    return full
+
+
+def report(name: str, full: dict, menus: int, requests: int) -> None:
+    times = sorted(full.values())
+    median = f'{statistics.median(times) * 1000:7.0f} ms' if times else '      - '
+    first = f'{times[0] * 1000:7.0f} ms' if times else '      - '
+    print(f'{name:<12} full menus {len(times)}/{menus}   first {first}   median {median}   requests {requests}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--menus', type=int, default=4, help='menus opened at the same time in the channel')
+    parser.add_argument('--emojis', type=int, default=5, help='reactions per menu')
+    parser.add_argument('--rtt', type=float, default=80, help='round trip time of a request, in ms')
+    parser.add_argument('--reset', type=float, default=250, help='reaction bucket reset, in ms')
+    parser.add_argument('--answer-after', type=float, default=10, help='the users answer after this many seconds')
+    args = parser.parse_args()
+
+    emojis = [f'{i}\N{COMBINING ENCLOSING KEYCAP}' for i in range(1, args.emojis + 1)]
+    loop = asyncio.get_event_loop()
+    for name, run in (('sequential', run_sequential), ('seeder', run_seeder)):
+        http = FakeHTTP(loop, args.rtt / 1000, args.reset / 1000)
+        full = loop.run_until_complete(run(http, make_messages(args.menus), emojis, args.answer_after))
+        report(name, full, args.menus, http.requests)
+
+
+if __name__ == '__main__':
+    main()
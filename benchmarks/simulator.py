@@ -0,0 +1,463 @@
+"""
+End-to-end load simulator : HelpCenterBot runs for real, without Discord.
+    python -m benchmarks.simulator [--users 50] [--duration 30] [--latency 50] [--rate-limit 0.01] [--replay events.jsonl]
+    python -m benchmarks.simulator --guilds 10 --shards 4  # several help guilds, AutoShardedBot
+
+The gateway is replaced by synthetic (or recorded) events fed to the discord.py parsers, one fake connection per shard
+reading its events in order, and the REST API, GitHub and Piston by a local aiohttp server, with a configurable latency
+and proportion of 429 responses.
+"""
+import argparse
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from urllib.parse import unquote
+
+from aiohttp import web
+
+os.environ.setdefault('MEMBER_CACHE', 'lean')  # the fake gateway can't answer the chunk requests
+STORAGE = tempfile.mkdtemp(prefix='simulator-')  # never the real archive and submission queue
+os.environ['EVENT_ARCHIVE'] = os.path.join(STORAGE, 'event_archive.sqlite3')
+os.environ['SUBMISSION_QUEUE'] = os.path.join(STORAGE, 'submissions.sqlite3')
+atexit.register(shutil.rmtree, STORAGE, ignore_errors=True)
+
+import discord  # noqa: E402
+
+from discord.shard import Shard  # noqa: E402
+from cogs.utils import misc, interactions  # noqa: E402
+
+BOT_USER = {'id': '100000000000000000', 'username': 'Help Center', 'discriminator': '0000', 'avatar': None, 'bot': True}
+
+COMMANDS = [
+    '/tag general ask',
+    '/tag discord embed',
+    '/tag programmation list',
+    '/tag errors maxchars',  # a tag with choices
+    '/tag general askk',  # fuzzy match
+    '/lines ```py\nfor i in range(10):\n    print(i)\n```',
+    '/googleit how to center a div',
+    '/help',
+    'Hello, can someone help me with my code ?',
+    'My token is NzkyNzE1NDU0MTk2MDg4ODQy.X-hvzA.Ovy4MCQywSkoMRRclStW4xAYK7I',
+]
+
+
+class Snowflakes:
+    def __init__(self):
+        self.counter = itertools.count(discord.utils.time_snowflake(datetime.utcnow()))
+
+    def __call__(self) -> str:
+        return str(next(self.counter))
+
+
+def user_payload(user_id, bot=False) -> dict:
+    return {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0001', 'avatar': None, 'bot': bot}
+
+
+def now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def json_response(data, status=200) -> web.Response:
+    """discord.py 1.6 only decodes the bodies with exactly this content type (web.json_response adds a charset)."""
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={'Content-Type': 'application/json'})
+
+
+class FakeGateway:
+    """
+    The connection of a shard : like DiscordWebSocket.received_message, its events are dispatched as socket_response
+    then parsed, in order, by one reader task. Only what the bot and discord.py use of a DiscordWebSocket is there.
+    """
+
+    def __init__(self, bot, shard_id: int):
+        self.bot = bot
+        self.shard_id = shard_id
+        self.latency = 0.0
+        self.open = True
+        self.events = 0
+        self.queue = asyncio.Queue()
+        self.reader = bot.loop.create_task(self.read())
+
+    async def read(self) -> None:
+        while True:
+            msg = await self.queue.get()
+            self.events += 1
+            self.bot.dispatch('socket_response', msg)
+            self.bot._connection.parsers[msg['t']](msg['d'])
+
+    def receive(self, event: str, data: dict) -> None:
+        self.queue.put_nowait({'op': 0, 't': event, 's': self.events, 'd': data})
+
+    async def change_presence(self, *, activity=None, status=None, afk=False, since=0.0) -> None:
+        pass
+
+    def is_ratelimited(self) -> bool:
+        return False
+
+    async def close(self, code: int = 1000) -> None:
+        self.open = False
+        self.reader.cancel()
+
+
+class FakeDiscord:
+    """REST stand-in for Discord, GitHub and Piston. Every message sent by the bot is echoed to the fake gateway."""
+
+    def __init__(self, simulator, latency: float, rate_limit: float, retry_after: float):
+        self.simulator = simulator
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self.routes = {}  # {route: count}
+
+        self.app = web.Application(client_max_size=10 * 1024 ** 2, middlewares=[self.middleware])
+        self.app.router.add_route('*', '/api/v7/{path:.*}', self.discord)
+        self.app.router.add_post('/github/gists', self.gist)
+        self.app.router.add_get('/piston/versions', self.piston_versions)
+        self.app.router.add_post('/piston/execute', self.piston_execute)
+
+    async def start(self, port: int = 0) -> str:
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', port)
+        await site.start()
+        return f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        self.requests += 1
+        route = f"{request.method} {request.match_info.route.resource.canonical if request.match_info.route.resource else request.path}"
+        self.routes[route] = self.routes.get(route, 0) + 1
+
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+        if random.random() < self.rate_limit:
+            self.rate_limited += 1
+            response = json_response({'message': 'You are being rate limited.', 'retry_after': self.retry_after, 'global': False}, status=429)
+            response.headers.update({'Via': '1.1 google', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': str(self.retry_after),
+                                     'Retry-After': str(self.retry_after)})
+            return response
+
+        response = await handler(request)
+        response.headers.setdefault('X-RateLimit-Limit', '5')
+        response.headers.setdefault('X-RateLimit-Remaining', '4')
+        response.headers.setdefault('X-RateLimit-Reset-After', '1')
+        return response
+
+    @staticmethod
+    async def read_payload(request) -> dict:
+        if request.content_type == 'multipart/form-data':  # with files
+            form = await request.post()
+            return json.loads(form.get('payload_json', '{}'))
+        if request.can_read_body:
+            return await request.json()
+        return {}
+
+    async def discord(self, request):
+        path = request.match_info['path'].split('/')
+        method = request.method
+
+        if path == ['users', '@me'] and method == 'GET':
+            return json_response(BOT_USER)
+        if path == ['users', '@me', 'channels'] and method == 'POST':  # DM channel
+            recipient = (await self.read_payload(request))['recipient_id']
+            return json_response({'id': recipient, 'type': 1, 'recipients': [user_payload(recipient)]})
+        if len(path) == 4 and path[0] == 'guilds' and path[2] == 'members':
+            return json_response({'user': user_payload(path[3]), 'roles': [], 'joined_at': now(), 'deaf': False, 'mute': False})
+
+        if path[0] == 'channels':
+            channel_id = path[1]
+            if len(path) == 3 and path[2] == 'messages' and method == 'POST':
+                payload = await self.read_payload(request)
+                message = self.simulator.bot_message(channel_id, payload)
+                return json_response(message)
+            if len(path) == 4 and path[2] == 'messages' and method == 'PATCH':
+                payload = await self.read_payload(request)
+                return json_response(self.simulator.bot_message(channel_id, payload, message_id=path[3]))
+            if len(path) == 3 and path[2] in ('messages', 'pins') and method == 'GET':  # history and pins
+                return json_response([])
+            if len(path) >= 6 and path[4] == 'reactions' and method == 'PUT':
+                self.simulator.bot_reaction(channel_id, path[3], path[5])
+            if len(path) == 2 and method == 'PATCH':
+                return json_response({'id': channel_id, 'type': 0, 'name': 'channel', 'position': 0, **await self.read_payload(request)})
+
+        return web.Response(status=204)
+
+    async def gist(self, request):
+        return json_response({'html_url': 'https://gist.github.com/simulated'}, status=201)
+
+    async def piston_versions(self, request):
+        return json_response([{'name': 'python3', 'aliases': ['py', 'python', 'python3'], 'version': '3.9.1'},
+                                  {'name': 'javascript', 'aliases': ['js', 'javascript'], 'version': '15.5.0'}])
+
+    async def piston_execute(self, request):
+        return json_response({'ran': True, 'language': 'python3', 'version': '3.9.1', 'output': '1', 'stdout': '1', 'stderr': ''})
+
+
+class Simulator:
+    def __init__(self, bot, *, users: int, reaction_rate: float, think_time: float):
+        self.bot = bot
+        self.state = bot._connection
+        self.users = users
+        self.reaction_rate = reaction_rate
+        self.think_time = think_time
+        self.snowflake = Snowflakes()
+
+        self.configs = list(bot.guild_configs.values())
+        self.channel_guilds = {channel_id: config.guild_id for config in self.configs for channel_id in config.authorized_channels_id}
+        self.channel_guilds[810511403202248754] = bot.bug_center_id  # the event code channel
+        self.sent_at = {}  # {message id: perf_counter when the message was fed to the bot}
+        self.latencies = []  # seconds, from the message to the end of the command
+        self.completed = 0
+        self.errors = 0
+        self.messages_fed = 0
+        self.tasks_alive = []
+        self.gateways = []  # [FakeGateway], one per shard
+
+        bot.add_listener(self.on_command_completion)
+        bot.add_listener(self.on_command_error)
+
+    # ---- fake gateway ----
+
+    def connect(self) -> None:
+        """Replace the gateway connections (one per shard, like AutoShardedClient.launch_shards), READY and GUILD_CREATE."""
+        self.state.user = discord.ClientUser(state=self.state, data=BOT_USER)
+        self.gateways = [FakeGateway(self.bot, shard_id) for shard_id in range(self.bot.shard_count or 1)]
+        if isinstance(self.bot, discord.AutoShardedClient):
+            self.state.shard_ids = range(self.bot.shard_count)
+            self.bot._reconnect = False  # set by AutoShardedClient.connect, read by Shard
+            for gateway in self.gateways:  # bot.shards, bot.latencies, guild.shard_id...
+                self.bot._AutoShardedClient__shards[gateway.shard_id] = Shard(gateway, self.bot, lambda item: None)
+        else:
+            self.bot.ws = self.gateways[0]
+        topic = 'event-name : Simulation\nevent-state : closed\nevent-date : 01/01/2021\nevent-autotests : [[\n{1} : [1]\n]]'
+
+        for config in self.configs:
+            roles = [{'id': str(config.guild_id), 'name': '@everyone', 'permissions': str(discord.Permissions.general().value), 'position': 0}]
+            roles += [{'id': str(role_id), 'name': str(role_id), 'permissions': '0', 'position': i + 1}
+                      for i, role_id in enumerate(config.tracked_roles)]
+            channels = [{'id': str(channel_id), 'type': 0, 'name': f'channel-{i}', 'position': i, 'permission_overwrites': [], 'topic': topic}
+                        for i, (channel_id, guild_id) in enumerate(self.channel_guilds.items()) if guild_id == config.guild_id]
+
+            guild = discord.Guild(data={
+                'id': str(config.guild_id), 'name': config.name or str(config.guild_id), 'member_count': self.users + 1, 'large': False,
+                'roles': roles, 'channels': channels, 'emojis': [], 'features': [], 'owner_id': BOT_USER['id'],
+                'members': [{'user': BOT_USER, 'roles': [], 'joined_at': now(), 'deaf': False, 'mute': False}]
+            }, state=self.state)
+            self.state._add_guild(guild)
+        self.bot._ready.set()
+
+    def feed(self, event: str, data: dict) -> None:
+        """The events of a guild go through the connection of its shard, the DMs through the first one, like on Discord."""
+        shard_id = (int(data['guild_id']) >> 22) % len(self.gateways) if data.get('guild_id') else 0
+        self.gateways[shard_id].receive(event, data)
+
+    def user_message(self, user_id: int, channel_id: int, content: str) -> str:
+        message_id = self.snowflake()
+        guild_id = self.channel_guilds[channel_id]
+        language_role = random.choice(list(self.bot.guild_configs[guild_id].language_roles))
+        self.sent_at[int(message_id)] = time.perf_counter()
+        self.messages_fed += 1
+        self.feed('MESSAGE_CREATE', {
+            'id': message_id, 'channel_id': str(channel_id), 'guild_id': str(guild_id), 'type': 0,
+            'author': user_payload(user_id), 'member': {'roles': [str(language_role)], 'joined_at': now(), 'deaf': False, 'mute': False},
+            'content': content, 'timestamp': now(), 'edited_timestamp': None, 'tts': False, 'mention_everyone': False,
+            'mentions': [], 'mention_roles': [], 'attachments': [], 'embeds': [], 'pinned': False
+        })
+        return message_id
+
+    def user_reaction(self, user_id: int, channel_id: str, message_id: str, emoji: str) -> None:
+        self.feed('MESSAGE_REACTION_ADD', {
+            'user_id': str(user_id), 'channel_id': channel_id, 'message_id': message_id, 'guild_id': str(self.channel_guilds[int(channel_id)]),
+            'emoji': {'id': None, 'name': emoji},
+            'member': {'user': user_payload(user_id), 'roles': [], 'joined_at': now(), 'deaf': False, 'mute': False}
+        })
+
+    # ---- called by the fake REST API ----
+
+    def bot_message(self, channel_id: str, payload: dict, message_id: str = None) -> dict:
+        message = {
+            'id': message_id or self.snowflake(), 'channel_id': channel_id, 'type': 0, 'author': BOT_USER,
+            'content': payload.get('content') or '', 'embeds': [payload['embed']] if payload.get('embed') else [],
+            'timestamp': now(), 'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [],
+            'mention_roles': [], 'attachments': [], 'pinned': False
+        }
+        if int(channel_id) in self.channel_guilds:
+            message['guild_id'] = str(self.channel_guilds[int(channel_id)])
+        if message_id is None:  # the gateway sends MESSAGE_CREATE for the messages sent by the bot
+            self.feed('MESSAGE_CREATE', dict(message))
+        return message
+
+    def bot_reaction(self, channel_id: str, message_id: str, emoji: str) -> None:
+        """A user answers a part of the menus (trash bin or choices) seeded by the bot."""
+        emoji = unquote(emoji)
+        if emoji in ('🗑️', '0️⃣', '✅') and random.random() < self.reaction_rate:
+            user_id = random.randint(1, self.users)  # the router ignores the other users, like a real crowd
+            self.bot.loop.call_later(random.uniform(0.1, 1.0), self.user_reaction, user_id, channel_id, message_id, emoji)
+
+    # ---- measures ----
+
+    async def on_command_completion(self, ctx):
+        self.completed += 1
+        if ctx.message and (sent_at := self.sent_at.pop(ctx.message.id, None)) is not None:
+            self.latencies.append(time.perf_counter() - sent_at)
+
+    async def on_command_error(self, ctx, error):
+        self.errors += 1
+        if ctx.message:
+            self.sent_at.pop(ctx.message.id, None)
+
+    async def user(self, user_id: int, deadline: float, script=COMMANDS) -> None:
+        while time.perf_counter() < deadline:
+            config = self.configs[user_id % len(self.configs)]  # the users are spread over the guilds
+            self.user_message(user_id, random.choice(config.authorized_channels_id), random.choice(script))
+            await asyncio.sleep(random.expovariate(1 / self.think_time) if self.think_time else 0)
+
+    async def replay(self, path: str) -> None:
+        """Replay recorded gateway events, one JSON object per line : {"t": "MESSAGE_CREATE", "d": {...}, "delay": 0.1}"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                await asyncio.sleep(event.get('delay', 0))
+                if event['t'] == 'MESSAGE_CREATE':
+                    self.sent_at[int(event['d']['id'])] = time.perf_counter()
+                    self.messages_fed += 1
+                self.feed(event['t'], event['d'])
+
+    async def sample_tasks(self, interval: float = 0.5) -> None:
+        while True:
+            self.tasks_alive.append(len(asyncio.all_tasks()))
+            await asyncio.sleep(interval)
+
+
+def percentile(values, q):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def write_guild_configs(guilds: int) -> str:
+    """Copy the main guild config for each simulated guild, with new ids, return the path of the file."""
+    with open('ressources/guilds.json', encoding='utf-8') as f:
+        main_config = json.load(f)[0]
+
+    snowflake = Snowflakes()
+    first_id = int(snowflake())
+    configs = [main_config] + [{
+        'guild_id': str(first_id + (i << 22)),  # the guild i is on the shard i % shard count (guild id >> 22)
+        'name': f'Guild {i}',
+        'staff_roles': {key: snowflake() for key in main_config['staff_roles']},
+        'help_channels': [snowflake() for __ in main_config['help_channels']],
+        'test_channels': [snowflake() for __ in main_config['test_channels']],
+        'language_roles': [[snowflake(), lang] for __, lang in main_config['language_roles']]
+    } for i in range(1, guilds)]
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(configs, f)
+    return f.name
+
+
+async def simulate(args) -> dict:
+    os.environ['GUILDS_CONFIG'] = write_guild_configs(args.guilds)
+    if args.shards:
+        os.environ['AUTO_SHARD'], os.environ['SHARD_COUNT'] = '1', str(args.shards)
+    from bot import get_bot_class
+
+    bot = get_bot_class()()  # AutoShardedHelpCenterBot with --shards
+    simulator = Simulator(bot, users=args.users, reaction_rate=args.reaction_rate, think_time=args.think_time)
+    fake = FakeDiscord(simulator, latency=args.latency / 1000, rate_limit=args.rate_limit, retry_after=args.retry_after)
+    base_url = await fake.start()
+
+    discord.http.Route.BASE = f'{base_url}/api/v7'
+    misc.GIST_API_URL = f'{base_url}/github'
+    misc.PISTON_API_URL = f'{base_url}/piston'
+    bot.extensions['cogs.miscellaneous'].DISCORD_API_URL = f'{base_url}/api/v7'  # load_extension makes its own module
+    interactions.API_URL = f'{base_url}/api/v7'
+
+    await bot.login('simulated-token')
+    simulator.connect()
+    sampler = bot.loop.create_task(simulator.sample_tasks())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if args.replay:
+        await simulator.replay(args.replay)
+    else:
+        deadline = start + args.duration
+        await asyncio.gather(*(simulator.user(user_id, deadline) for user_id in range(1, args.users + 1)))
+    await asyncio.sleep(args.drain)  # let the last commands finish
+    elapsed = time.perf_counter() - start
+    __, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sampler.cancel()
+    os.remove(os.environ['GUILDS_CONFIG'])
+    report = {
+        'users': args.users,
+        'guilds': len(bot.guild_configs),
+        'shards': len(simulator.gateways),
+        'duration_s': elapsed,
+        'messages': simulator.messages_fed,
+        'commands_completed': simulator.completed,
+        'commands_failed': simulator.errors,
+        'commands_per_s': simulator.completed / elapsed,
+        'latency_p50_ms': percentile(simulator.latencies, 0.5) * 1000,
+        'latency_p99_ms': percentile(simulator.latencies, 0.99) * 1000,
+        'latency_mean_ms': statistics.mean(simulator.latencies) * 1000 if simulator.latencies else float('nan'),
+        'tasks_alive_max': max(simulator.tasks_alive, default=0),
+        'tasks_alive_end': len(asyncio.all_tasks()),
+        'reaction_waiters_end': bot.reaction_router.pending,
+        'traced_memory_peak_mb': peak_memory / 1024 ** 2,
+        'max_rss_mb': misc.max_rss_mb(),
+        'rest_requests': fake.requests,
+        'rest_rate_limited': fake.rate_limited,
+        'gateway_events_by_shard': [gateway.events for gateway in simulator.gateways],
+        'rest_routes': dict(sorted(fake.routes.items(), key=lambda item: -item[1])),
+    }
+
+    await bot.close()
+    await fake.runner.cleanup()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.simulator')
+    parser.add_argument('--users', type=int, default=50, help='Simulated users sending messages at the same time.')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of traffic.')
+    parser.add_argument('--guilds', type=int, default=1, help='Help guilds served by the process (copies of the main config).')
+    parser.add_argument('--shards', type=int, default=0, help='Run an AutoShardedBot with this shard count.')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between two messages of a user.')
+    parser.add_argument('--reaction-rate', type=float, default=0.5, help='Proportion of the menus answered by a reaction.')
+    parser.add_argument('--latency', type=float, default=50, help='Mean latency of the fake REST API, in milliseconds.')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Proportion of the REST calls answered by a 429.')
+    parser.add_argument('--retry-after', type=float, default=0.5, help='retry_after of the 429 responses.')
+    parser.add_argument('--drain', type=float, default=3.0, help='Seconds to wait for the last commands after the traffic.')
+    parser.add_argument('--replay', default=None, help='Recorded gateway events to replay instead of the synthetic traffic.')
+    parser.add_argument('--output', default=None, help='Where to write the report (JSON).')
+    args = parser.parse_args()
+
+    report = asyncio.get_event_loop().run_until_complete(simulate(args))
+    for key, value in report.items():
+        if key != 'rest_routes':
+            print(f'{key:<25}{value:>12.2f}' if isinstance(value, float) else f'{key:<25}{value!s:>12}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
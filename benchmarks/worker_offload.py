@@ -0,0 +1,77 @@
+"""
+Event loop lag while the CPU-bound jobs run : on the loop, in the default thread pool, and in the worker processes.
+    python -m benchmarks.worker_offload [--jobs 8] [--attachment-size 4000000] [--probe 5]
+
+A probe sleeps `probe` ms in a loop and records how late it wakes up, like the gateway heartbeat would be.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from cogs.utils import jobs
+from cogs.utils.workers import WorkerPool
+
+COUNTS = {'python3': 42, 'javascript': 57, 'rust': 9, 'go': 14, 'c++': 21, 'java': 17, 'ruby': 5, 'php': 8}
+CODE = 'const client = new Discord.Client();\nclient.on("ready", () => console.log(`Logged in as ${client.user.tag}!`));\n'
+
+
+def workloads(size: int) -> dict:
+    attachment = (CODE * (size // len(CODE) + 1))[:size].encode()
+    return {
+        'read_attachment': (jobs.read_attachment, attachment),
+        'render_bar_chart': (jobs.render_bar_chart, COUNTS, 'Breakdown by languages used.'),
+    }
+
+
+async def probe(interval: float, lags: list, stop: asyncio.Event) -> None:
+    loop = asyncio.get_event_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def measure(mode: str, job, args, count: int, interval: float, pool: WorkerPool) -> (float, list):
+    loop = asyncio.get_event_loop()
+    lags, stop = [], asyncio.Event()
+    probe_task = loop.create_task(probe(interval, lags, stop))
+    await asyncio.sleep(interval * 4)
+
+    start = time.perf_counter()
+    if mode == 'event loop':
+        for __ in range(count):
+            job(*args)
+            await asyncio.sleep(0)
+    elif mode == 'threads':
+        await asyncio.gather(*(loop.run_in_executor(None, job, *args) for __ in range(count)))
+    else:
+        await asyncio.gather(*(pool.run(job, *args) for __ in range(count)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    return elapsed, lags
+
+
+async def main(args) -> None:
+    pool = WorkerPool(processes=args.processes, max_pending=args.jobs)
+    for name, (job, *job_args) in workloads(args.attachment_size).items():
+        job(*job_args)  # the imports (filetype, matplotlib) are not measured
+        await asyncio.gather(*(pool.run(job, *job_args) for __ in range(pool.processes)))  # same for the workers
+
+        print(f"\n{name} x {args.jobs}")
+        print(f"{'mode':<14}{'total ms':>10}{'lag max ms':>12}{'lag p50 ms':>12}")
+        for mode in ('event loop', 'threads', 'workers'):
+            elapsed, lags = await measure(mode, job, job_args, args.jobs, args.probe / 1000, pool)
+            print(f'{mode:<14}{elapsed * 1000:>10.1f}{max(lags) * 1000:>12.1f}{statistics.median(lags) * 1000:>12.1f}')
+    pool.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=8, help='jobs of each kind')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (min(4, cpus) by default)')
+    parser.add_argument('--attachment-size', type=int, default=4_000_000, help='bytes of the attachment read')
+    parser.add_argument('--probe', type=float, default=5, help='probe interval, in ms')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Union
+
+import discord
+from discord.ext import commands
+
+from cogs.utils import i18n, custom_errors, misc, metrics, interactions
+from cogs.utils.startup_profiler import StartupProfiler
+from cogs.utils.intents import add_event_intents
+from cogs.utils.guild_config import load_guild_configs
+from cogs.utils.expiry_wheel import ExpiryWheel
+from cogs.utils.outbox import Outbox
+from cogs.utils.context import HelpCenterContext
+from cogs.utils.reaction_router import ReactionRouter
+from cogs.utils.reaction_seeder import ReactionSeeder
+from cogs.utils.workers import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+MEMBER_CACHE_SIZE = 10000  # members kept in lean mode
+
+gateway_events = metrics.counter('gateway_events_total', 'Gateway events received, by type.', ('type',))
+dispatch_count = metrics.counter('dispatch_total', 'Events dispatched to the listeners, by event.', ('event',))
+dispatch_seconds = metrics.counter('dispatch_seconds_total', 'Time spent to dispatch the events, by event.', ('event',))
+command_duration = metrics.histogram('command_duration_seconds', 'Time to run the commands, by command.', ('command',))
+rest_duration = metrics.histogram('rest_request_duration_seconds', 'Discord REST calls duration, by method and route.', ('method', 'route'))
+rest_rate_limits = metrics.counter('rest_rate_limits_total', 'Discord REST calls rate limited (429), by route.', ('route',))
+loop_lag = metrics.gauge('event_loop_lag_seconds', 'Delay of a 1 second sleep on the event loop.')
+
+
+class RateLimitCounter(logging.Filter):
+    """discord.py handles the 429 responses itself, and only logs them with the bucket (channel:guild:route)."""
+
+    def filter(self, record):
+        if isinstance(record.msg, str) and record.msg.startswith('We are being rate limited') and len(record.args) > 1:
+            rest_rate_limits.inc(str(record.args[1]).split(':', 2)[-1])
+        return True
+
+
+rate_limit_counter = RateLimitCounter()
+
+
+class HelpCenterBot(commands.Bot):
+
+    def __init__(self, profiler: StartupProfiler = None):
+        self.started_at = time.perf_counter()
+        self.profiler = profiler
+        self.guild_configs = load_guild_configs(os.getenv('GUILDS_CONFIG', 'ressources/guilds.json'))  # {guild id: GuildConfig}
+
+        # the main guild : events, and the commands used in DM
+        main_config = next(iter(self.guild_configs.values()))
+        self.bug_center_id = main_config.guild_id
+        self.staff_roles = main_config.staff_roles
+        self.help_channels_id = main_config.help_channels_id
+        self.test_channels_id = main_config.test_channels_id
+        self.authorized_channels_id = main_config.authorized_channels_id
+        self.test_channels = main_config.test_channels
+        self.authorized_channels = main_config.authorized_channels
+        self.language_roles = main_config.language_roles
+        self.tracked_roles = frozenset().union(*(config.tracked_roles for config in self.guild_configs.values()))
+
+        # lean mode : don't chunk the guild, only keep the members who interacted with the bot or have a tracked role
+        self.lean_member_cache = os.getenv('MEMBER_CACHE', 'full') == 'lean'
+        self.member_cache = OrderedDict()  # {(guild id, user id): discord.Member}, LRU used in lean mode
+
+        # completed with the events really listened once the extensions are loaded, before the connection
+        # the members intent is required to chunk, and in lean mode to receive the roles updates (GUILD_MEMBER_UPDATE)
+        intents = discord.Intents(guilds=True, members=True)
+
+        super().__init__(
+            command_prefix="/",
+            case_insensitive=True,
+            # lean mode : discord.py keeps no member, the LRU does (see on_raw_member_event)
+            member_cache_flags=discord.MemberCacheFlags.none() if self.lean_member_cache else discord.MemberCacheFlags.from_intents(intents),
+            chunk_guilds_at_startup=not self.lean_member_cache,
+            allowed_mentions=discord.AllowedMentions.none(),
+            intents=intents,
+            shard_count=int(os.environ['SHARD_COUNT']) if os.getenv('SHARD_COUNT') else None  # AutoShardedBot : None to use the recommended count
+        )
+        
+        self.logger = logger
+        self.cog_states = {}  # {cog name: state}, filled during a reload, see reload_extension
+        self.expiry_wheel = ExpiryWheel(self)
+        self.outbox = Outbox(self)
+        self.reaction_router = ReactionRouter(self)
+        self.reaction_seeder = ReactionSeeder(self)
+        self.workers = WorkerPool(processes=int(os.getenv('WORKER_PROCESSES', 0)) or None)
+
+        metrics.gauge('reaction_waiters', 'Reaction waiters pending on the router.', lambda: self.reaction_router.pending)
+        metrics.gauge('expiring_messages', 'Interactive messages waiting for their expiration.', lambda: len(self.expiry_wheel))
+        metrics.gauge('worker_jobs_pending', 'Jobs queued or running in the worker processes.', lambda: self.workers.pending)
+        self.instrument_http()
+        self.loop.create_task(self.measure_loop_lag())
+        if port := os.getenv('METRICS_PORT'):  # optional Prometheus endpoint, on http://127.0.0.1:<port>/metrics
+            self.loop.create_task(metrics.start_http_server(int(port)))
+
+        extensions = ['event', 'tag', 'help', 'command_error', 'miscellaneous', 'lines', 'google_it']
+        for extension in extensions:
+            if self.profiler:
+                with self.profiler.measure(f'load extension {extension}'):
+                    self.load_extension('cogs.'+extension)
+            else:
+                self.load_extension('cogs.'+extension)
+        i18n.lazy_descriptions(self.walk_commands())
+
+        self.before_invoke(self.before_command)
+        self.after_invoke(self.after_command)
+        self.add_check(self.is_on_configured_guild)
+        if self.lean_member_cache:
+            self.add_listener(self.on_member_message, 'on_message')
+
+        add_event_intents(intents, {'on_message'} | set(self.extra_events))  # on_message to process the commands
+
+        if self.profiler:
+            self.profiler.milestone('bot initialized')
+            self.add_listener(self.on_first_command, 'on_command_completion')
+
+    async def on_ready(self):
+        activity = discord.Game("/tag <category> <tag>")
+        await self.change_presence(status=discord.Status.idle, activity=activity)
+        self.logger.info(f"Logged in as : {self.user.name}")
+        self.logger.info(f"ID : {self.user.id}")
+
+        members_cached = sum(len(guild.members) for guild in self.guilds if guild.id in self.guild_configs) + len(self.member_cache)
+        max_rss = misc.max_rss_mb()
+        self.logger.info(f"Ready in {time.perf_counter() - self.started_at:.2f}s ({'lean' if self.lean_member_cache else 'full'} member cache) : "
+                         f"{members_cached} members cached{f', max RSS {max_rss:.1f} MB' if max_rss else ''}")
+
+        if self.profiler:
+            self.profiler.milestone('on_ready')
+
+    async def on_first_command(self, ctx):
+        self.remove_listener(self.on_first_command, 'on_command_completion')
+        self.profiler.milestone(f'first command served ({ctx.command.qualified_name})')
+        self.profiler.uninstall()
+        self.logger.info(self.profiler.report())
+
+    def dispatch(self, event_name, *args, **kwargs):
+        start = time.perf_counter()
+        super().dispatch(event_name, *args, **kwargs)
+        dispatch_count.inc(event_name)
+        dispatch_seconds.inc(event_name, amount=time.perf_counter() - start)
+
+    async def on_socket_response(self, msg):
+        gateway_events.inc(msg.get('t') or f"op {msg.get('op')}")
+        if msg.get('t') == 'INTERACTION_CREATE' and msg['d'].get('type') == interactions.APPLICATION_COMMAND:
+            ctx = interactions.InteractionContext(self, msg['d'])
+            if ctx.command is not None:  # handled by the cogs with an on_slash_<name> listener
+                self.dispatch(f'slash_{ctx.name}', ctx)
+        elif self.lean_member_cache and msg.get('t') in ('GUILD_MEMBER_UPDATE', 'GUILD_MEMBER_REMOVE'):
+            self.on_raw_member_event(msg['t'], msg['d'])
+
+    async def get_context(self, message, *, cls=HelpCenterContext):
+        return await super().get_context(message, cls=cls)
+
+    def reload_extension(self, name, *, package=None):
+        """
+        The cogs of the extension hand their state (caches, indexes, queues...) over to the new instances :
+        export_state() is called on the old cog, the new one takes the state from bot.cog_states in its __init__.
+        """
+        self.cog_states = {cog.qualified_name: cog.export_state() for cog in self.cogs.values()
+                           if cog.__module__ == name and hasattr(cog, 'export_state')}
+        try:
+            super().reload_extension(name, package=package)
+        finally:  # also after a failed reload, the old extension is set up again
+            self.cog_states.clear()
+            i18n.lazy_descriptions(self.walk_commands())
+            i18n.rendered_texts.clear()
+
+    def get_guild_config(self, guild: Union[discord.Guild, None]):
+        """The config of the guild, the main one in DM, None for a guild not configured."""
+        return self.guild_configs.get(guild.id) if guild else self.guild_configs[self.bug_center_id]
+
+    def is_on_configured_guild(self, ctx):
+        if ctx.guild and ctx.guild.id not in self.guild_configs:
+            raise custom_errors.NotInBugCenter()
+        return True
+
+    async def before_command(self, ctx: commands.Context) -> None:  # function called when a command is executed
+        ctx.started_at = time.perf_counter()
+        await self.set_actual_language(ctx.author)
+
+    async def after_command(self, ctx: commands.Context) -> None:
+        command_duration.observe(time.perf_counter() - ctx.started_at, ctx.command.qualified_name)
+
+    def instrument_http(self) -> None:
+        logging.getLogger('discord.http').addFilter(rate_limit_counter)  # added once, the same filter
+
+        request = self.http.request
+
+        async def instrumented_request(route, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            finally:
+                rest_duration.observe(time.perf_counter() - start, route.method, route.path)
+
+        self.http.request = instrumented_request
+
+    async def measure_loop_lag(self, interval: float = 1.0) -> None:
+        while True:
+            start = self.loop.time()
+            await asyncio.sleep(interval)
+            loop_lag.set(max(0.0, self.loop.time() - start - interval))
+
+    async def set_actual_language(self, user: Union[discord.Member, discord.User]) -> None:
+        if not hasattr(user, 'guild') or user.guild.id not in self.guild_configs:  # if the function was executed in DM
+            user = await self.fetch_bug_center_member(user.id) or user
+        i18n.current_locale.set(self.get_user_language(user))
+
+    def get_user_language(self, user: Union[discord.Member, discord.User]) -> str:
+        if not hasattr(user, 'guild') or user.guild.id not in self.guild_configs:  # if the function was executed in DM
+            user = self.get_bug_center_member(user.id)
+            if not user:
+                return self.guild_configs[self.bug_center_id].default_language
+
+        return self.guild_configs[user.guild.id].get_language(user)
+
+    def get_bug_center_member(self, user_id: int, guild_id: int = None) -> Union[discord.Member, None]:
+        """The member in a configured guild, the main one by default."""
+        guild_id = guild_id or self.bug_center_id
+        return self.get_guild(guild_id).get_member(user_id) or self.member_cache.get((guild_id, user_id))
+
+    async def fetch_bug_center_member(self, user_id: int, guild_id: int = None) -> Union[discord.Member, None]:
+        if (member := self.get_bug_center_member(user_id, guild_id)) or not self.lean_member_cache:
+            return member
+
+        try: member = await self.get_guild(guild_id or self.bug_center_id).fetch_member(user_id)
+        except discord.HTTPException: return None
+
+        self.cache_member(member)
+        return member
+
+    def cache_member(self, member: discord.Member) -> None:
+        key = (member.guild.id, member.id)
+        self.member_cache[key] = member
+        self.member_cache.move_to_end(key)
+        if len(self.member_cache) > MEMBER_CACHE_SIZE:
+            self.member_cache.popitem(last=False)
+
+    async def on_member_message(self, message: discord.Message):
+        member = message.author
+        if isinstance(member, discord.Member) and not member.bot and member.guild.id in self.guild_configs:
+            self.cache_member(member)
+
+    def on_raw_member_event(self, event: str, data: dict) -> None:
+        """
+        Lean mode : discord.py doesn't dispatch on_member_update for the members it doesn't cache, so the raw events
+        keep the LRU up to date (roles changes), and add the members who get a tracked role.
+        """
+        guild_id, user_id = int(data['guild_id']), int(data['user']['id'])
+        if data['user'].get('bot') or not (config := self.guild_configs.get(guild_id)) or not (guild := self.get_guild(guild_id)):
+            return
+
+        key = (guild_id, user_id)
+        if event == 'GUILD_MEMBER_REMOVE':
+            self.member_cache.pop(key, None)
+        elif key in self.member_cache or any(int(role_id) in config.tracked_roles for role_id in data['roles']):
+            self.cache_member(discord.Member(data=data, guild=guild, state=self._connection))
+
+    async def close(self):
+        self.workers.close()
+        await super().close()
+
+    def run(self):
+        super().run(os.getenv("BOT_TOKEN"), reconnect=True)
+
+
+class AutoShardedHelpCenterBot(HelpCenterBot, commands.AutoShardedBot):  # one process for several guilds
+    pass
+
+
+def get_bot_class():
+    return AutoShardedHelpCenterBot if os.getenv('AUTO_SHARD') == '1' else HelpCenterBot
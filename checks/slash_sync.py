@@ -0,0 +1,203 @@
+"""
+Check of create_slash_command.py --sync, run it from the repository root :
+    python -m checks.slash_sync
+
+- diff : checks/slash_commands.json holds a recorded GET /applications/<id>/commands response (with the ids, versions and
+  default values added by Discord) and the command files it was created from. Each case changes one side and checks the
+  reported lines.
+- sync : create_slash_command.main runs with --api pointing at a local fake API, which records the PUT requests. The
+  unchanged scopes must be skipped and each changed scope updated with exactly one bulk PUT of the command files.
+"""
+import asyncio
+import copy
+import itertools
+import json
+import os
+
+from aiohttp import web
+
+import create_slash_command
+from create_slash_command import COMMAND_DEFAULTS, diff, load_commands, parser
+
+RECORDED = os.path.join(os.path.dirname(__file__), 'slash_commands.json')
+APPLICATION_ID = '789210550255550485'
+
+
+def get_command(commands: list, name: str) -> dict:
+    return next(command for command in commands if command['name'] == name)
+
+
+def get_option(commands: list, name: str, option_name: str) -> dict:
+    return next(option for option in get_command(commands, name)['options'] if option['name'] == option_name)
+
+
+def add_command(registered, files):
+    files.append({'name': 'ping', 'description': 'Pong.'})
+
+
+def remove_command(registered, files):
+    files.remove(get_command(files, 'event'))
+
+
+def change_description(registered, files):
+    get_command(files, 'tag')['description'] = "Envoyez rapidement de l'aide !"
+
+
+def add_category(registered, files):
+    get_option(files, 'tag', 'category')['choices'].append({'name': 'python', 'value': 'python'})
+
+
+def make_optional(registered, files):
+    del get_option(files, 'tag', 'query')['required']
+
+
+def explicit_defaults(registered, files):
+    get_command(files, 'event').update(type=1, default_permission=True)
+    get_option(files, 'event', 'stats')['required'] = False
+
+
+def omitted_defaults(registered, files):  # a registered command without the default values
+    for command in registered:
+        del command['default_permission'], command['type']
+
+
+def reorder(registered, files):
+    registered.reverse()
+
+
+def several_changes(registered, files):
+    add_command(registered, files)
+    remove_command(registered, files)
+    add_category(registered, files)
+
+
+DIFF_CASES = [
+    ('up to date', lambda registered, files: None, []),
+    ('command added', add_command, ['  + ping']),
+    ('command removed', remove_command, ['  - event']),
+    ('description changed', change_description, ['  ~ tag']),
+    ('category added', add_category, ['  ~ tag']),
+    ('option not required anymore', make_optional, ['  ~ tag']),
+    ('default values written in the file', explicit_defaults, []),
+    ('default values omitted by the API', omitted_defaults, []),
+    ('commands in another order', reorder, []),
+    ('several changes', several_changes, ['  + ping', '  - event', '  ~ tag']),
+]
+
+
+class FakeAPI:
+    """GET and PUT (bulk overwrite) /applications/<id>[/guilds/<id>]/commands, the commands are kept by scope."""
+
+    def __init__(self):
+        self.registered = {}  # {scope: [command]}, the global scope is None
+        self.puts = []  # [(scope, payload)]
+        self.put_status = 200
+        self.ids = itertools.count(832608742468698142)
+
+    def register(self, commands: list) -> list:
+        """The commands as Discord returns them : with ids and the default values."""
+        return [{'id': str(next(self.ids)), 'application_id': APPLICATION_ID, 'version': str(next(self.ids)), **COMMAND_DEFAULTS, **command}
+                for command in copy.deepcopy(commands)]
+
+    async def get_commands(self, request):
+        return web.json_response(self.registered.get(request.match_info.get('guild_id'), []))
+
+    async def put_commands(self, request):
+        scope, payload = request.match_info.get('guild_id'), await request.json()
+        self.puts.append((scope, payload))
+        if self.put_status != 200:
+            return web.json_response({'message': 'Internal Server Error', 'code': 0}, status=self.put_status)
+        self.registered[scope] = self.register(payload)
+        return web.json_response(self.registered[scope])
+
+    async def start(self) -> str:
+        app = web.Application()
+        for path in ('/api/applications/{application_id}/commands', '/api/applications/{application_id}/guilds/{guild_id}/commands'):
+            app.router.add_get(path, self.get_commands)
+            app.router.add_put(path, self.put_commands)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api'
+
+
+async def unchanged_and_changed_guilds(api, run):
+    commands = load_commands()
+    api.registered = {'1': api.register(commands), '2': api.register(commands[1:])}
+    success = await run('--guild', '1', '--guild', '2')
+    return success and api.puts == [('2', commands)]
+
+
+async def second_sync(api, run):  # everything is up to date after the first one
+    api.registered = {'1': api.register(load_commands()[1:])}
+    await run('--guild', '1')
+    api.puts.clear()
+    success = await run('--guild', '1')
+    return success and api.puts == []
+
+
+async def global_scope(api, run):
+    commands = load_commands()
+    api.registered = {None: api.register(commands[:1])}
+    success = await run()
+    return success and api.puts == [(None, commands)]
+
+
+async def dry_run(api, run):
+    api.registered = {'1': []}
+    success = await run('--guild', '1', '--dry-run')
+    return success and api.puts == []
+
+
+async def failed_put(api, run):
+    api.registered, api.put_status = {'1': []}, 500
+    success = await run('--guild', '1')
+    return not success and len(api.puts) == 1
+
+
+SYNC_CASES = [
+    ('unchanged guild skipped, changed guild updated once', unchanged_and_changed_guilds),
+    ('second sync without requests', second_sync),
+    ('global commands', global_scope),
+    ('dry run without requests', dry_run),
+    ('failed update reported', failed_put),
+]
+
+
+def check_diff() -> int:
+    with open(RECORDED, encoding='utf-8') as f:
+        recorded = json.load(f)
+
+    failures = 0
+    for name, change, expected in DIFF_CASES:
+        registered, files = copy.deepcopy(recorded['registered']), copy.deepcopy(recorded['files'])
+        change(registered, files)
+        lines = diff(registered, files)
+        failures += lines != expected
+        print(f"{'ok' if lines == expected else 'FAILED':<8}diff : {name}" + ('' if lines == expected else f' : {lines} instead of {expected}'))
+    return failures
+
+
+async def check_sync() -> int:
+    os.environ['CLIENT_ID'] = APPLICATION_ID
+    failures = 0
+    for name, case in SYNC_CASES:
+        api = FakeAPI()
+        url = await api.start()
+        try:
+            ok = await case(api, lambda *arguments: create_slash_command.main(parser.parse_args(['--sync', '--api', url, *arguments])))
+        finally:
+            await api.runner.cleanup()
+        failures += not ok
+        print(f"{'ok' if ok else 'FAILED':<8}sync : {name}" + ('' if ok else f' : {len(api.puts)} PUT {[scope for scope, __ in api.puts]}'))
+    return failures
+
+
+def main() -> None:
+    failures = check_diff() + asyncio.get_event_loop().run_until_complete(check_sync())
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
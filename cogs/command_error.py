@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import errors
 
-from .utils import custom_errors
+from .utils import custom_errors, i18n
 from.utils.misc import Color
 from .utils.i18n import use_current_gettext as _
 
@@ -11,13 +11,20 @@ class CommandError(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def send_error(self, ctx, error_message):
+        if ctx.message is None:  # a slash command, the error answers the interaction
+            return await ctx.send(embed=self.create_error_embed(ctx, error_message), delete_after=10)
+
+        # the errors of a burst (several commands sent quickly) are merged in one message
+        self.bot.outbox.send_notice(ctx.channel, ctx.author.id, error_message, build=lambda text: self.create_error_embed(ctx, text), delete_after=10)
+
     @staticmethod
-    async def send_error(ctx, error_message):
+    def create_error_embed(ctx, error_message) -> discord.Embed:
         embed = discord.Embed(
             title="<:error:797539791545565184> Erreur",
             url="https://discord.gg/Drbgufc",
             description=error_message,
-            timestamp=ctx.message.created_at,
+            timestamp=ctx.message.created_at if ctx.message else ctx.created_at,
             color=Color.black().discord
         )
         embed.set_author(
@@ -25,11 +32,10 @@ class CommandError(commands.Cog):
             icon_url=ctx.author.avatar_url
         )
         embed.set_footer(
-            text=_("{ctx.bot.user.name}#{ctx.bot.user.discriminator} open-source project").format(**locals()),
+            text=i18n.render_cached('error footer', lambda: _("{ctx.bot.user.name}#{ctx.bot.user.discriminator} open-source project").format(ctx=ctx)),
             icon_url=ctx.bot.user.avatar_url
         )
-
-        await ctx.send(embed=embed, delete_after=10)
+        return embed
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx, error):
@@ -38,16 +44,18 @@ class CommandError(commands.Cog):
             return
 
         if isinstance(error, custom_errors.NotAuthorizedChannels):
-            formatted_text = (_("You can't execute this command in <#{ctx.channel.id}>. Try in one of these channels :\n\n").format(**locals()) +
-                              f"<#{'>, <#'.join(str(chan_id) for chan_id in error.list_channels_id)}>")
+            formatted_text = i18n.render_cached(('not authorized channels', ctx.channel.id, tuple(error.list_channels_id)), lambda: (
+                _("You can't execute this command in <#{ctx.channel.id}>. Try in one of these channels :\n\n").format(ctx=ctx) +
+                f"<#{'>, <#'.join(str(chan_id) for chan_id in error.list_channels_id)}>"))
             return await self.send_error(ctx, formatted_text)
         if isinstance(error, custom_errors.NotAuthorizedRoles):
-            formatted_text = (_("You can't execute this command, you need one of these roles :\n\n").format(**locals()) +
-                              f"<@&{'>, <@&'.join(str(role_id) for role_id in error.list_roles_id)}>")
+            formatted_text = i18n.render_cached(('not authorized roles', tuple(error.list_roles_id)), lambda: (
+                _("You can't execute this command, you need one of these roles :\n\n") +
+                f"<@&{'>, <@&'.join(str(role_id) for role_id in error.list_roles_id)}>"))
             return await self.send_error(ctx, formatted_text)
         if isinstance(error, commands.MissingRequiredArgument):
-            formatted_text = (_("A required argument is missing in the command !\n") +
-                              f"`{ctx.command.usage}`")
+            formatted_text = i18n.render_cached(('missing argument', ctx.command.qualified_name), lambda: (
+                _("A required argument is missing in the command !\n") + f"`{ctx.command.usage}`"))
             return await self.send_error(ctx, formatted_text)
         if isinstance(error, errors.PrivateMessageOnly):
             return await self.send_error(ctx, _('This command must be executed in Private Messages'))
@@ -1,18 +1,19 @@
 import re
 import io
-import json
+import os
+import time
 import asyncio
-from urllib import request
 from functools import partial
 from datetime import datetime
 from collections import OrderedDict
 
 import discord
 from discord.ext import commands
-import matplotlib.pyplot as plt
-from matplotlib.ticker import StrMethodFormatter
 
-from .utils import custom_errors, checkers, misc
+from .utils import custom_errors, checkers, misc, i18n, jobs, metrics
+from .utils.codeblock import find_participation
+from .utils.event_archive import EventArchive, ARCHIVE_PATH
+from .utils.submission_queue import SubmissionQueue, QUEUE_PATH
 from .utils.i18n import use_current_gettext as _
 
 RE_EVENT_DATE = re.compile(r'(?<=event-date : )(\d{,2})/(\d{,2})/(\d{4})')
@@ -21,14 +22,20 @@ RE_EVENT_NAME = re.compile(r'(?<=event-name : )(.+)')
 RE_EVENT_AUTOTESTS_GROUP = re.compile(r'event-autotests : \[\[\n(.*)\n]]', re.MULTILINE | re.DOTALL)
 RE_EVENT_AUTOTEST = re.compile(r'{(.*?)} : \[\s*(.*?)\s*]', re.MULTILINE | re.DOTALL)
 
-RE_GET_CODE_PARTICIPATION = re.compile(r'(```)?(?:(\S*)\s)(\s*\S[\S\s]*)(?(1)```|)')
 RE_ENDLINE_SPACES = re.compile(r' *\n')
 
 
 CODE_CHANNEL_ID = 810511403202248754
 
-with request.urlopen('https://emkc.org/api/v1/piston/versions') as r:
-    AVAILABLE_LANGUAGES: list = json.loads(r.read().decode('utf-8'))
+SUBMISSION_WORKERS = 2  # number of participations tested at the same time
+
+LEADERBOARD_TITLE = 'Leaderboard'
+LEADERBOARD_DEBOUNCE = 5  # seconds, the edits of the pinned leaderboard are coalesced over this window
+PARTICIPATIONS_FRESHNESS = 10  # seconds, a scan of the code channel is reused by the commands during this window
+
+participation_lookups = metrics.counter('participation_lookups_total', 'Event.get_participations calls, by source (scan, shared scan, snapshot).', ('source',))
+
+AVAILABLE_LANGUAGES: list = []  # loaded on the first participation, see get_available_languages
 
 LANGUAGES_EQUIVALENT = {
     ('node', 'typescript', 'deno'): 'javascript',
@@ -38,6 +45,14 @@ LANGUAGES_EQUIVALENT = {
 }
 
 
+async def get_available_languages() -> list:
+    if not AVAILABLE_LANGUAGES:
+        languages = await misc.get_piston_versions()
+        if not AVAILABLE_LANGUAGES:  # could have been loaded by a concurrent call
+            AVAILABLE_LANGUAGES.extend(languages)
+    return AVAILABLE_LANGUAGES
+
+
 def event_not_closed():
     async def inner(ctx):
         code_channel = ctx.bot.get_channel(CODE_CHANNEL_ID)
@@ -73,36 +88,127 @@ class Event(commands.Cog):
         self.bot = bot
         self.code_channel_id = 810511403202248754
 
+        self.leaderboard_message: discord.Message = None
+        self.leaderboard_entries = None  # {participation message id: (user id, language, length, date)}
+        self.leaderboard_task: asyncio.Task = None
+
+        self.participations_scan: asyncio.Task = None  # the code channel history crawl in progress, shared by the callers
+        self.participations_snapshot = None  # (time of the scan, [(language, infos), ...] in history order, datas, datas_global)
+        self.participations_generation = 0  # incremented when a participation changes, older scans are not reused
+
+        if (state := bot.cog_states.pop(self.qualified_name, None)) is not None:  # reloaded
+            self.import_state(state)
+        else:
+            self.archive = EventArchive(os.getenv('EVENT_ARCHIVE', ARCHIVE_PATH))
+            self.submissions = SubmissionQueue(os.getenv('SUBMISSION_QUEUE', QUEUE_PATH))
+
+        self.submission_event = asyncio.Event()
+        self.submission_event.set()  # resume the submissions interrupted by a restart (or a reload)
+        self.submission_workers = [self.bot.loop.create_task(self.submission_worker()) for __ in range(SUBMISSION_WORKERS)]
+
+    def cog_unload(self):
+        for worker in self.submission_workers:  # the running submissions are released, the new workers take them back
+            worker.cancel()
+
+    def export_state(self) -> dict:
+        leaderboard_pending = self.leaderboard_task is not None and not self.leaderboard_task.done()
+        if leaderboard_pending:
+            self.leaderboard_task.cancel()
+        return {
+            'leaderboard_message': self.leaderboard_message,
+            'leaderboard_entries': self.leaderboard_entries,
+            'leaderboard_pending': leaderboard_pending,
+            'archive': self.archive,
+            'submissions': self.submissions,
+            'available_languages': list(AVAILABLE_LANGUAGES)
+        }
+
+    def import_state(self, state: dict) -> None:
+        self.leaderboard_message = state['leaderboard_message']
+        self.leaderboard_entries = state['leaderboard_entries']
+        if state['leaderboard_pending']:
+            self.schedule_leaderboard_update()
+        self.archive = state['archive']
+        self.submissions = state['submissions']
+        if not AVAILABLE_LANGUAGES:  # still loaded if the reload failed
+            AVAILABLE_LANGUAGES.extend(state['available_languages'])
+
+    @commands.Cog.listener()
+    async def on_slash_event(self, ctx):
+        if ctx.subcommand == 'stats':  # the graph takes more than the 3 seconds allowed for the first response
+            await ctx.defer()
+        await ctx.invoke_command()
+
     @commands.group(
         name='event',
         description=_('Participate or get informations about an event.'),
         invoke_without_command=True
     )
     async def event(self, ctx):
-        if ctx.guild and ctx.channel.id not in self.bot.test_channels_id:  # Not in dm or in tests channels
-            raise custom_errors.NotAuthorizedChannels(self.bot.test_channels_id)
+        config = self.bot.get_guild_config(ctx.guild)
+        if ctx.guild and ctx.channel.id not in config.test_channels:  # Not in dm or in tests channels
+            raise custom_errors.NotAuthorizedChannels(config.test_channels_id)
 
         embed = discord.Embed(
             title=_("Use of /event"),
             color=misc.Color.grey_embed().discord
         )
 
-        for command in ctx.command.commands:
-            if command.hidden: continue
-            embed.add_field(name=f"** • {command.name} : {_(command.description)}**", value=f"`{command.usage}`", inline=False)
+        fields = i18n.render_cached('event usage', lambda: [(f"** • {command.name} : {command.description}**", f"`{command.usage}`")
+                                                            for command in ctx.command.commands if not command.hidden])
+        for name, value in fields:
+            embed.add_field(name=name, value=value, inline=False)
 
         await ctx.send(embed=embed)
 
-    async def get_participations(self, user=None) -> (dict, list, dict):
+    async def get_participations(self, user=None, *, max_age: float = PARTICIPATIONS_FRESHNESS) -> (dict, list, dict):
+        """
+        Return the participations by language, all of them (both sorted), and those of user by language.
+        Concurrent callers share one scan of the code channel, its result is reused for max_age seconds.
+        """
+        snapshot = self.participations_snapshot
+        if snapshot is not None and time.monotonic() - snapshot[0] <= max_age:
+            participation_lookups.inc('snapshot')
+        else:
+            if self.participations_scan is None:
+                participation_lookups.inc('scan')
+                self.participations_scan = self.bot.loop.create_task(self.scan_participations())
+            else:
+                participation_lookups.inc('shared scan')
+            snapshot = await asyncio.shield(self.participations_scan)  # a cancelled caller doesn't cancel the others
+
+        __, participations, datas, datas_global = snapshot
+        user_infos = {language: infos for language, infos in participations if infos[1].id == user.id} if user else {}
+        return datas, datas_global, user_infos
+
+    def invalidate_participations(self):
+        self.participations_generation += 1
+        self.participations_snapshot = None
+        self.participations_scan = None  # the next callers don't join a scan that may miss the change
+
+    async def scan_participations(self):
+        generation = self.participations_generation
+        scanned_at = time.monotonic()
+        try:
+            snapshot = (scanned_at, *await self.crawl_participations())
+            if generation == self.participations_generation:
+                self.participations_snapshot = snapshot
+            return snapshot
+        finally:
+            if generation == self.participations_generation:
+                self.participations_scan = None
+
+    async def crawl_participations(self) -> (list, dict, list):
         code_channel = self.bot.get_channel(self.code_channel_id)
         event_informations = self.get_informations()
 
+        participations = []
         datas = dict()
         datas_global = []
-        user_infos = dict()
 
         async for message in code_channel.history(limit=None, after=event_informations['date']):
             if message.author.id != self.bot.user.id or not message.embeds: continue
+            if message.embeds[0].title == LEADERBOARD_TITLE: continue
 
             fields = message.embeds[0].fields
 
@@ -114,9 +220,7 @@ class Event(commands.Cog):
             date = datetime.fromisoformat(fields[3].value)
 
             infos = (message, code_author, length, date)
-
-            if user and user.id == code_author.id:
-                user_infos[language] = infos
+            participations.append((language, infos))
 
             datas.setdefault(language, [])
             datas[language].append(infos)
@@ -127,7 +231,12 @@ class Event(commands.Cog):
         datas = {key: sorted(value, key=sort_key) for key, value in datas.items()}
         datas_global = sorted(datas_global, key=sort_key)
 
-        return datas, datas_global, user_infos
+        return participations, datas, datas_global
+
+    @staticmethod
+    def get_ranking(datas, datas_global, language, participation) -> (int, int):
+        """Return the global and by language rankings (from 1) of a participation."""
+        return datas_global.index(participation) + 1, datas[language].index(participation) + 1
 
     def get_informations(self):
         channel = self.bot.get_channel(CODE_CHANNEL_ID)
@@ -144,6 +253,74 @@ class Event(commands.Cog):
 
         return {'state': state, 'date': date, 'name': name, 'autotests': autotests}
 
+    def update_leaderboard_entry(self, message_id, user_id, language, length, date):
+        self.invalidate_participations()
+        if self.leaderboard_entries is not None:  # otherwise the next refresh will load everything from the history
+            self.leaderboard_entries[message_id] = (user_id, language, length, date)
+        self.schedule_leaderboard_update()
+
+    def remove_leaderboard_entry(self, message_id):
+        self.invalidate_participations()
+        if self.leaderboard_entries is not None:
+            self.leaderboard_entries.pop(message_id, None)
+        self.schedule_leaderboard_update()
+
+    def schedule_leaderboard_update(self):
+        if self.leaderboard_task is None or self.leaderboard_task.done():
+            self.leaderboard_task = self.bot.loop.create_task(self.update_leaderboard())
+
+    async def update_leaderboard(self, *, delay=LEADERBOARD_DEBOUNCE):
+        if self.leaderboard_entries is None:
+            __, datas_global, __ = await self.get_participations()
+            self.leaderboard_entries = {message.id: (author.id, message.embeds[0].fields[1].value, length, date)
+                                        for message, author, length, date in datas_global}
+
+        await asyncio.sleep(delay)
+        self.leaderboard_task = None  # changes made from now will schedule a new edit
+
+        embed = self.create_leaderboard_embed()
+        message = await self.get_leaderboard_message()
+        try:
+            if message: return await message.edit(embed=embed)
+        except discord.NotFound:
+            pass
+
+        self.leaderboard_message = await self.bot.get_channel(self.code_channel_id).send(embed=embed)
+        try: await self.leaderboard_message.pin()
+        except discord.HTTPException: pass
+
+    async def get_leaderboard_message(self):
+        if self.leaderboard_message is None:
+            code_channel = self.bot.get_channel(self.code_channel_id)
+            self.leaderboard_message = discord.utils.find(lambda message: message.author.id == self.bot.user.id and message.embeds and message.embeds[0].title == LEADERBOARD_TITLE,
+                                                          await code_channel.pins())
+        return self.leaderboard_message
+
+    def create_leaderboard_embed(self):  # not translated, the message is shared by everyone
+        sort_key = lambda entry: entry[2:4]  # length and date
+        entries = sorted(self.leaderboard_entries.values(), key=sort_key)
+        medals = ['🥇', '🥈', '🥉']
+
+        embed = discord.Embed(
+            title=LEADERBOARD_TITLE,
+            color=misc.Color.grey_embed().discord,
+            description='\n'.join(f"{medals[i] if i < 3 else f'`{i + 1}.`'} <@{user_id}> - {language} - {length} chars"
+                                   for i, (user_id, language, length, __) in enumerate(entries[:10])) or 'No participation yet.'
+        )
+
+        by_language = {}
+        for entry in entries:
+            by_language.setdefault(entry[1], []).append(entry)
+
+        for language, language_entries in sorted(by_language.items())[:24]:  # 25 fields max per embed
+            embed.add_field(name=language,
+                            value='\n'.join(f"{medals[i]} <@{user_id}> - {length} chars" for i, (user_id, __, length, __) in enumerate(language_entries[:3])),
+                            inline=True)
+
+        embed.set_footer(text=f'{len(entries)} participations')
+        embed.timestamp = datetime.utcnow()
+        return embed
+
     async def edit_informations(self, state=None, date=None, name=None):
         channel: discord.TextChannel = self.bot.get_channel(CODE_CHANNEL_ID)
         new_topic = channel.topic
@@ -166,106 +343,165 @@ class Event(commands.Cog):
     @event_not_ended()
     @event_not_closed()
     async def participate(self, ctx, *, code):
-        code_channel = self.bot.get_channel(self.code_channel_id)
-
-        re_match = RE_GET_CODE_PARTICIPATION.search(code)
-        if not re_match:
+        code_block = find_participation(code)
+        if not code_block:
             raise commands.CommandError(_('Your message must contains a block of code (with code language) ! *look `/tag discord markdown`*'))
-        language, code = re_match.groups()[1:]
+        language, code = code_block.language, code_block.body
         code = code.strip()
         if len(code) > 1000:
             return await ctx.send(_("Looks like your code is too long! Try to remove the useless parts, the goal is to have a short and optimized code!"))
 
-        language = discord.utils.find(lambda i: language.lower() in i['aliases'], AVAILABLE_LANGUAGES)
+        available_languages = await get_available_languages()
+        language = discord.utils.find(lambda i: language.lower() in i['aliases'], available_languages)
         if not language:
             return await ctx.send(_('Your language seems not be valid for the event.'))
 
-        __, __, user_infos = await self.get_participations(user=ctx.author)
-        old_participation: discord.Message = obj[0] if (obj := user_infos.get(language['name'])) else None
-
         aliased_language = discord.utils.find(lambda couple: language['name'] in couple[0], LANGUAGES_EQUIVALENT.items())
         if aliased_language:
-            language = discord.utils.find(lambda i: aliased_language[1] == i['name'], AVAILABLE_LANGUAGES) or language
+            language = discord.utils.find(lambda i: aliased_language[1] == i['name'], available_languages) or language
 
         valid_message = await ctx.send(_('**This is your participation :**\n\n') +
                                        _('`Language` -> `{0}`\n').format(language['name']) +
                                        _('`Length` -> `{0}`\n').format(len(code)) +
                                        f'```{language["name"]}\n{code}```\n' +
-                                       _('Do you want ot post it ? ✅ ❌'))
+                                       _('Do you want ot post it ? ✅ ❌'), wait=True)
 
-        self.bot.loop.create_task(misc.add_reactions(valid_message, ['✅', '❌']))
+        seeding = self.bot.reaction_seeder.seed(valid_message, ['✅', '❌'])
 
-        try: reaction, user = await self.bot.wait_for('reaction_add', check=lambda react, usr: not usr.bot and react.message.id == valid_message.id and str(react.emoji) in ['✅', '❌'], timeout=120)
+        try: reaction, user = await self.bot.reaction_router.wait_for(valid_message.id, emojis=['✅', '❌'], timeout=120)
         except asyncio.TimeoutError: return
+        finally: seeding.cancel()
 
         if str(reaction.emoji) == '✅':
-            event_informations = self.get_informations()
+            position = await self.bot.loop.run_in_executor(self.submissions.executor, self.submissions.put, ctx.author.id, language['name'], code)
+            self.submission_event.set()
 
-            if autotests := event_informations['autotests']:
-                embed = discord.Embed(title=_('<a:typing:832608019920977921> Your code is passing some tests...'),
-                                      description='\n'.join(f'➖ Test {i+1}/{len(autotests)}' for i in range(len(autotests))),
-                                      color=misc.Color.grey_embed().discord)
+            try: await ctx.send(_('Your participation is queued for the tests, position in the queue : **{0}**.').format(position))
+            except: pass
+        else:
+            try: await ctx.send(_('Cancelled'))
+            except: pass  # prevent error if the user close his MP
 
-                testing_message: discord.Message = await ctx.send(embed=embed)
+    async def submission_worker(self):
+        await self.bot.wait_until_ready()
 
-                for i, (args, result) in enumerate(autotests):
-                    try: execution_result = await misc.execute_piston_code(language['name'], code, args=args.split('|'))
-                    except Exception: return await testing_message.edit(content=_('An error occurred.'))
+        while True:
+            self.submission_event.clear()  # before the claim : set again by a participation queued during the claim
+            claim = self.bot.loop.run_in_executor(self.submissions.executor, self.submissions.claim)
+            try:
+                submission = await asyncio.shield(claim)
+            except asyncio.CancelledError:  # the claim still runs in the executor, its submission is released
+                claim.add_done_callback(self.release_claimed)
+                raise
+            if submission is None:
+                await self.submission_event.wait()
+                continue
 
-                    if error_message := execution_result.get('stderr'):
-                        embed.title = _('Your code excited with an error.')
-                        embed.description = f'```\n{error_message[:2000]}\n```'
-                        embed.colour = misc.Color(255, 100, 100).discord
+            try:
+                status = await self.process_submission(submission)
+            except asyncio.CancelledError:  # it will be resumed by the next worker, the executor runs the release before its claim
+                self.bot.loop.run_in_executor(self.submissions.executor, self.submissions.release, submission.id)
+                raise
+            except Exception as e:
+                self.bot.logger.error(f'The submission {submission.id} failed : {e}')
+                status = 'failed'
+
+            await self.bot.loop.run_in_executor(self.submissions.executor, self.submissions.finish, submission.id, status)
+
+    def release_claimed(self, claim):
+        """Done callback of a claim whose worker was cancelled : nobody will run its submission."""
+        if claim.cancelled() or claim.exception() is not None or claim.result() is None:
+            return
+        self.submissions.executor.submit(self.submissions.release, claim.result().id)
+
+    async def process_submission(self, submission) -> str:
+        user = self.bot.get_user(submission.user_id) or await self.bot.fetch_user(submission.user_id)
+        await self.bot.set_actual_language(user)
+        language, code = submission.language, submission.code
 
-                        return await testing_message.edit(embed=embed)
+        event_informations = self.get_informations()
+        if event_informations['state'] != 'open':
+            await user.send(_('The event is ended, sorry !'))
+            return 'cancelled'
 
-                    stdout = execution_result['stdout'].strip()
-                    stdout = RE_ENDLINE_SPACES.sub('\n', stdout)
-                    if stdout != result:
-                        embed.title = _("Your code didn't pass all the tests. If you think it's an error, please contact a staff.")
-                        embed.colour = misc.Color(255, 100, 100).discord
+        if autotests := event_informations['autotests']:
+            if not await self.run_autotests(user, language, code, autotests):
+                return 'rejected'
 
-                        description_lines = embed.description.split('\n')
-                        description_lines[i] = f'❌ Test {i+1}/{len(autotests)}'
-                        embed.description = '\n'.join(description_lines)
+        __, __, user_infos = await self.get_participations(user=user)
+        old_participation: discord.Message = obj[0] if (obj := user_infos.get(language)) else None
 
-                        return await testing_message.edit(embed=embed)
+        embed = discord.Embed(
+            title="Participation :",
+            color=misc.Color.grey_embed().discord
+        )
+        embed.add_field(name='User', value=f'{user.id}|{user.mention}', inline=False)
+        embed.add_field(name='Language', value=language, inline=True)
+        embed.add_field(name='Length', value=str(len(code)), inline=True)
+        embed.add_field(name='Date', value=str((date := datetime.now()).isoformat()), inline=False)
+        embed.add_field(name='Code', value=f"```{language}\n{code}\n```", inline=False)
+
+        if old_participation:
+            await old_participation.edit(embed=embed)
+            await old_participation.clear_reactions()
+            participation = old_participation
+            response = _("Your entry has been successfully modified !")
+        else:
+            participation = await self.bot.get_channel(self.code_channel_id).send(embed=embed)
+            response = _("Your entry has been successfully sent !")
+
+        self.update_leaderboard_entry(participation.id, user.id, language, len(code), date)
+
+        try: await user.send(response)
+        except: pass
+        return 'done'
 
-                    description_lines = embed.description.split('\n')
-                    description_lines[i] = f'✅ Test {i + 1}/{len(autotests)}'
-                    embed.description = '\n'.join(description_lines)
-                    await testing_message.edit(embed=embed)
+    async def run_autotests(self, user, language, code, autotests) -> bool:
+        embed = discord.Embed(title=_('<a:typing:832608019920977921> Your code is passing some tests...'),
+                              description='\n'.join(f'➖ Test {i+1}/{len(autotests)}' for i in range(len(autotests))),
+                              color=misc.Color.grey_embed().discord)
 
-                    await asyncio.sleep(1)
+        testing_message: discord.Message = await user.send(embed=embed)
 
-                embed.title = _('All tests passed successfully.')
-                embed.colour = misc.Color(100, 255, 100).discord
+        for i, (args, result) in enumerate(autotests):
+            try: execution_result = await misc.execute_piston_code(language, code, args=args.split('|'))
+            except Exception:
+                await testing_message.edit(content=_('An error occurred.'))
+                return False
+
+            if error_message := execution_result.get('stderr'):
+                embed.title = _('Your code excited with an error.')
+                embed.description = f'```\n{error_message[:2000]}\n```'
+                embed.colour = misc.Color(255, 100, 100).discord
 
                 await testing_message.edit(embed=embed)
+                return False
 
-            embed = discord.Embed(
-                title="Participation :",
-                color=misc.Color.grey_embed().discord
-            )
-            embed.add_field(name='User', value=f'{ctx.author.id}|{ctx.author.mention}', inline=False)
-            embed.add_field(name='Language', value=language['name'], inline=True)
-            embed.add_field(name='Length', value=str(len(code)), inline=True)
-            embed.add_field(name='Date', value=str(datetime.now().isoformat()), inline=False)
-            embed.add_field(name='Code', value=f"```{language['name']}\n{code}\n```", inline=False)
-
-            if old_participation:
-                await old_participation.edit(embed=embed)
-                await old_participation.clear_reactions()
-                response = _("Your entry has been successfully modified !")
-            else:
-                await code_channel.send(embed=embed)
-                response = _("Your entry has been successfully sent !")
+            stdout = execution_result['stdout'].strip()
+            stdout = RE_ENDLINE_SPACES.sub('\n', stdout)
+            if stdout != result:
+                embed.title = _("Your code didn't pass all the tests. If you think it's an error, please contact a staff.")
+                embed.colour = misc.Color(255, 100, 100).discord
 
-            try: await ctx.send(response)
-            except: pass
-        else:
-            try: await ctx.send(_('Cancelled'))
-            except: pass  # prevent error if the user close his MP
+                description_lines = embed.description.split('\n')
+                description_lines[i] = f'❌ Test {i+1}/{len(autotests)}'
+                embed.description = '\n'.join(description_lines)
+
+                await testing_message.edit(embed=embed)
+                return False
+
+            description_lines = embed.description.split('\n')
+            description_lines[i] = f'✅ Test {i + 1}/{len(autotests)}'
+            embed.description = '\n'.join(description_lines)
+            await testing_message.edit(embed=embed)
+
+            await asyncio.sleep(1)
+
+        embed.title = _('All tests passed successfully.')
+        embed.colour = misc.Color(100, 255, 100).discord
+
+        await testing_message.edit(embed=embed)
+        return True
 
     @event.command(
         name='cancel',
@@ -275,8 +511,9 @@ class Event(commands.Cog):
     @event_not_ended()
     @event_not_closed()
     async def cancel(self, ctx):
-        if ctx.guild and ctx.channel.id not in self.bot.test_channels_id:  # Not in dm or in tests channels
-            raise custom_errors.NotAuthorizedChannels(self.bot.test_channels_id)
+        config = self.bot.get_guild_config(ctx.guild)
+        if ctx.guild and ctx.channel.id not in config.test_channels:  # Not in dm or in tests channels
+            raise custom_errors.NotAuthorizedChannels(config.test_channels_id)
 
         __, __, user_infos = await self.get_participations(user=ctx.author)
         if not user_infos:
@@ -289,16 +526,15 @@ class Event(commands.Cog):
             reactions = ['0️⃣', '1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣']
 
             selectable = OrderedDict(user_infos)
-            message = await ctx.send(_("__Choose which participation you want to cancel :__\n")+'\n'.join([f"{reactions[i]} - `{language}`" for i, language in enumerate(selectable.keys())]))
-            self.bot.loop.create_task(misc.add_reactions(message, reactions[:len(selectable)]))
+            message = await ctx.send(_("__Choose which participation you want to cancel :__\n")+'\n'.join([f"{reactions[i]} - `{language}`" for i, language in enumerate(selectable.keys())]), wait=True)
+            seeding = self.bot.reaction_seeder.seed(message, reactions[:len(selectable)])
 
             try:
-                reaction, __ = await self.bot.wait_for('reaction_add', timeout=120,
-                                                       check=lambda react, usr: str(react.emoji) in reactions[:len(selectable)] and usr.id == ctx.author.id and react.message.id == message.id)
-            except TimeoutError:
-                try: await message.delete()
-                except: pass
-                return
+                reaction, __ = await self.bot.reaction_router.wait_for(message.id, user_id=ctx.author.id, emojis=reactions[:len(selectable)], timeout=120)
+            except asyncio.TimeoutError:
+                return self.bot.expiry_wheel.delete(message)
+            finally:
+                seeding.cancel()
 
             try: await message.clear_reactions()
             except: pass
@@ -306,6 +542,7 @@ class Event(commands.Cog):
             old_participation: discord.Message = list(user_infos.values())[reactions.index(str(reaction.emoji))][0]
 
         await old_participation.delete()
+        self.remove_leaderboard_entry(old_participation.id)
         await ctx.send(_('Your participation has been successfully deleted'))
 
     @event.command(
@@ -315,8 +552,9 @@ class Event(commands.Cog):
     )
     @event_not_closed()
     async def stats(self, ctx):
-        if ctx.guild and ctx.channel.id not in self.bot.test_channels_id:  # Not in dm or in tests channels
-            raise custom_errors.NotAuthorizedChannels(self.bot.test_channels_id)
+        config = self.bot.get_guild_config(ctx.guild)
+        if ctx.guild and ctx.channel.id not in config.test_channels:  # Not in dm or in tests channels
+            raise custom_errors.NotAuthorizedChannels(config.test_channels_id)
 
         datas, datas_global, user_infos = await self.get_participations(ctx.author)
 
@@ -330,8 +568,7 @@ class Event(commands.Cog):
         )
 
         for language, data in user_infos.items():
-            global_ranking = datas_global.index(data) + 1
-            language_ranking = datas[language].index(data) + 1
+            global_ranking, language_ranking = self.get_ranking(datas, datas_global, language, data)
 
             formatted_informations = _("• Global ranking : **{}** *({} > you > {})*\n").format(
                 global_ranking,
@@ -351,32 +588,12 @@ class Event(commands.Cog):
 
         embed.set_image(url="attachment://graph.png")
 
-        fn = partial(self.create_graph_bars, datas, _("Breakdown by languages used."))
-        final_buffer = await self.bot.loop.run_in_executor(None, fn)
+        counts = {language: len(participations) for language, participations in datas.items()}
+        graph = await self.bot.workers.run(jobs.render_bar_chart, counts, _("Breakdown by languages used."))
 
-        file = discord.File(filename="graph.png", fp=final_buffer)
+        file = discord.File(filename="graph.png", fp=io.BytesIO(graph))
 
-        await ctx.channel.send(embed=embed, file=file)
-
-    @staticmethod
-    def create_graph_bars(datas, title):  # title in arguments because translations doesn't work in a separated thread
-        fig, ax = plt.subplots()
-        langs = datas.keys()
-        values = [len(v) for v in datas.values()]
-        ax.bar(langs, values,
-               color=misc.Color(10, 100, 255, 0.5).mpl,
-               edgecolor=misc.Color(10, 100, 255).mpl,
-               linewidth=5)
-
-        ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}'))  # No decimal places
-        ax.set_yticks(range(1, max(values) + 1))
-        ax.set_title(title)
-        buff = io.BytesIO()
-        fig.savefig(buff)
-        buff.seek(0)
-        del fig
-
-        return buff
+        await ctx.send(embed=embed, file=file)
 
     @event.command(
         name='start',
@@ -388,12 +605,21 @@ class Event(commands.Cog):
         code_channel: discord.TextChannel = self.bot.get_channel(self.code_channel_id)
 
         await self.edit_informations(state='open', date=datetime.now(), name=name)
+        self.invalidate_participations()
 
         await ctx.send(f'Event `{name}` started ! Participations are now open !')
         await code_channel.send('```diff\n'
                                 f'- {name.upper()}\n'
                                 '```')
 
+        if old_leaderboard := await self.get_leaderboard_message():  # a new leaderboard is pinned for each event
+            try: await old_leaderboard.unpin()
+            except discord.HTTPException: pass
+        self.leaderboard_message = None
+        self.leaderboard_entries = {}
+        if self.leaderboard_task: self.leaderboard_task.cancel()
+        self.leaderboard_task = self.bot.loop.create_task(self.update_leaderboard(delay=0))
+
     @event.command(
         name='stop',
         usage='/event stop',
@@ -402,9 +628,16 @@ class Event(commands.Cog):
     @checkers.is_high_staff()
     async def stop(self, ctx):
         await self.edit_informations(state='ended')
+        if self.leaderboard_task: self.leaderboard_task.cancel()
 
         event_informations = self.get_informations()
-        datas, datas_global, *__ = await self.get_participations()
+        datas, datas_global, *__ = await self.get_participations(max_age=0)  # the final ranking
+
+        # archived first : the messages below can fail, /event history must still have the event
+        participations = [(author.id, message.embeds[0].fields[1].value, length, date, self.get_participation_code(message))
+                          for message, author, length, date in datas_global]
+        fn = partial(self.archive.archive, event_informations['name'], event_informations['date'], participations)
+        await self.bot.loop.run_in_executor(None, fn)
 
         medals = ['🥇', '🥈', '🥉']
         formatted_text = ("```diff\n"
@@ -435,6 +668,43 @@ class Event(commands.Cog):
 
         await ctx.send(f"Event `{event_informations['name']}` is now ended ! Participations are closed !", file=discord.File(buffer, 'ranking.txt'))
 
+        self.leaderboard_entries = None  # reload the final ranking from the history
+        try: await self.update_leaderboard(delay=0)
+        except discord.HTTPException as e: self.bot.logger.warning(f'The final leaderboard could not be updated : {e}')
+
+    @staticmethod
+    def get_participation_code(message):
+        code_block = message.embeds[0].fields[4].value  # ```language\ncode\n```
+        return code_block[code_block.find('\n') + 1:-4]
+
+    @event.command(
+        name='history',
+        description=_('Get your best results in the past events'),
+        usage='/event history [user]'
+    )
+    async def history(self, ctx, user: discord.User = None):
+        config = self.bot.get_guild_config(ctx.guild)
+        if ctx.guild and ctx.channel.id not in config.test_channels:  # Not in dm or in tests channels
+            raise custom_errors.NotAuthorizedChannels(config.test_channels_id)
+
+        user = user or ctx.author
+        results = await self.bot.loop.run_in_executor(None, self.archive.user_results, user.id)
+
+        if not results:
+            return await ctx.send(_("{0} didn't participate to any event.").format(user))
+
+        embed = discord.Embed(
+            title=_('Best results of {0}').format(user),
+            color=misc.Color.grey_embed().discord
+        )
+        for name, stopped_at, language, length, global_rank, language_rank, participants in results:
+            embed.add_field(name=f"{name} ({datetime.fromisoformat(stopped_at).strftime('%d/%m/%Y')})",
+                            value=_("• `{0}` - {1} chars\n• Global ranking : **{2}**/{3}\n• By language ranking : **{4}**").format(
+                                language, length, global_rank, participants, language_rank),
+                            inline=False)
+
+        await ctx.send(embed=embed)
+
     @event.command(
         name='close',
         usage='/event close',
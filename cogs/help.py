@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 
-from .utils import checkers, misc
+from .utils import checkers, misc, i18n
 from .utils.i18n import use_current_gettext as _
 
 
@@ -13,7 +13,7 @@ class HelpCommand(commands.HelpCommand):
         self.add_check(checkers.authorized_channels_check)
 
     async def on_help_command_error(self, ctx, error):
-        print(error)
+        ctx.bot.logger.error(error)
 
     async def send_error_message(self, error):
         embed = discord.Embed(
@@ -24,14 +24,19 @@ class HelpCommand(commands.HelpCommand):
         await self.context.send(embed=embed)
 
     async def send_bot_help(self, mapping):
+        commands_list = i18n.render_cached(('help', self.context.prefix, 'not hidden'), lambda: "\n".join(
+            [f"`{self.context.prefix}{cmd.name}` : {cmd.description}" for cmd in self.context.bot.commands if not cmd.hidden]
+        ))  # the hidden commands are the staff tools (gateway, reload...)
         embed = discord.Embed(
             title=_("Here are my commands:"),
-            description="\n".join([f"`{self.context.prefix}{cmd.name}` : {_(cmd.description)}" for cmd in self.context.bot.commands]),
+            description=commands_list,
             color=misc.Color.grey_embed().discord
         )
         await self.context.send(embed=embed)
 
     async def send_command_help(self, command):
+        if command.hidden:  # the staff tools (reload, gateway...) are not advertised
+            return await self.send_error_message(await self.command_not_found(command.name))
         embed = discord.Embed(
             title=f"{command.name}",
             description=command.description,
@@ -44,7 +49,7 @@ class HelpCommand(commands.HelpCommand):
         await self.context.send(embed=embed)
 
     async def command_not_found(self, string):
-        return _("The command {string} way not found.").format(string)
+        return _("The command {string} way not found.").format(string=string)
 
 
 def setup(bot):
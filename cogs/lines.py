@@ -1,10 +1,9 @@
-import re
-
 import discord
 from discord.ext import commands
 
 from .utils.misc import delete_with_emote
 from .utils import checkers
+from .utils.codeblock import find_code_block, number_lines
 from .utils.i18n import use_current_gettext as _
 
 
@@ -19,20 +18,18 @@ class Lines(commands.Cog):
     )
     @checkers.authorized_channels()
     async def lines(self, ctx):
-        result = re.search(r'```(?:(\S*)\n)?(\s*\S[\S\s]*)```', ctx.message.content)
+        code_block = find_code_block(ctx.message.content)
 
-        if not result:
+        if not code_block:
             raise commands.CommandError(_('Your message must contains a block of code ! *look `/tag discord code block`*'))
 
-        numbered_code = '\n'.join(f'{i:>3} | {line}' for i, line in enumerate(result.group(2).splitlines()))
-        if len(numbered_code) > 1950:
-            numbered_code = numbered_code[:1950] + '\netc...'
+        numbered_code = number_lines(code_block.text, *code_block.body_span, budget=1950)
 
         response_message = await ctx.send(_('Numbered code of {ctx.author} :\n').format(**locals()) +
-                                          '```' + (result.group(1) or '') + '\n' +
+                                          '```' + (code_block.language or '') + '\n' +
                                           numbered_code +
                                           '\n```')
-        await ctx.message.delete()
+        self.bot.outbox.delete(ctx.message)
         await delete_with_emote(ctx, response_message)
 
 
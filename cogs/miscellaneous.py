@@ -5,43 +5,104 @@
 
 import asyncio
 import os
-import re
+import time
 
 import aiohttp
 import discord
 from discord.ext import commands
-import filetype
 
-from .utils.misc import create_new_gist, add_reactions
+from .utils.misc import create_new_gist
+from .utils import checkers, metrics, jobs, custom_errors
 from .utils.i18n import use_current_gettext as _
 
+DISCORD_API_URL = "https://discord.com/api/v8"
+INLINE_ATTACHMENT_SIZE = 64 * 1024  # bigger attachments are read by a worker process
+
+stage_count = metrics.counter('on_message_stage_total', 'Messages processed by each stage of on_message.', ('stage',))
+stage_seconds = metrics.counter('on_message_stage_seconds_total', 'Time spent in each stage of on_message.', ('stage',))
+rejected_messages = metrics.counter('on_message_rejected_total', 'Messages rejected by the intake stage, by reason.', ('reason',))
+
 
 class Miscellaneous(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.re_token = re.compile(r"[\w\-=]+\.[\w\-=]+\.[\w\-=]+", re.ASCII)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        await self.bot.set_actual_language(message.author)
+        with metrics.timed(stage_count, stage_seconds, 'intake'):
+            reason = self.reject_reason(message)
+        if reason:
+            return rejected_messages.inc(reason)
+
         if await self.token_revoke(message): return
-        if message.channel.id not in self.bot.authorized_channels_id: return
+        if message.channel.id not in self.bot.guild_configs[message.guild.id].authorized_channels: return
         await self.attachement_to_gist(message)
 
+    def reject_reason(self, message: discord.Message):
+        """Return why no feature will handle the message, or None."""
+        if message.author.bot or message.webhook_id:
+            return 'bot'
+        if message.guild is None or (config := self.bot.guild_configs.get(message.guild.id)) is None:  # a token can't be deleted in DM
+            return 'guild'
+        if message.channel.id not in config.authorized_channels and '.' not in message.content:  # only the token check remains
+            return 'channel'
+        return None
+
+    @commands.command(
+        name='gateway',
+        usage='/gateway',
+        hidden=True
+    )
+    @checkers.is_high_staff()
+    async def gateway(self, ctx):
+        gateway_events = metrics.REGISTRY['gateway_events_total'].values
+        dispatch_count = metrics.REGISTRY['dispatch_total'].values
+        dispatch_seconds = metrics.REGISTRY['dispatch_seconds_total'].values
+
+        lines = [f"{'gateway event':<28}{'count':>10}"]
+        lines += [f"{event_type:<28}{int(count):>10}" for (event_type,), count in sorted(gateway_events.items(), key=lambda item: -item[1])[:20]]
+        lines += ['', f"{'dispatched event':<28}{'count':>10}{'total ms':>12}"]
+        lines += [f"{event:<28}{int(count):>10}{dispatch_seconds[(event,)] * 1000:>12.1f}" for (event,), count in sorted(dispatch_count.items(), key=lambda item: -item[1])[:20]]
+
+        await ctx.send('```\n' + '\n'.join(lines)[:1980] + '\n```')
+
+    @commands.command(
+        name='reload',
+        usage='/reload <extension>',
+        hidden=True
+    )
+    @checkers.is_high_staff()
+    async def reload(self, ctx, extension):
+        start = time.perf_counter()
+        try:
+            self.bot.reload_extension(f'cogs.{extension}')
+        except commands.ExtensionError as e:
+            return await ctx.send(f'```\n{e}\n```')
+
+        self.bot.logger.info(f"Extension [{extension}] reloaded by {ctx.author}.")
+        await ctx.send(f'Extension `{extension}` reloaded in {(time.perf_counter() - start) * 1000:.1f} ms.')
+
     async def attachement_to_gist(self, message):
         if not message.attachments: return
         else: attachment = message.attachments[0]
 
-        file = await message.attachments[0].read()
-        if filetype.guess(file) is not None: return
-
-        try: file_content = file.decode('utf-8')
-        except: return
-
-        if await self.token_revoke(message, attach_content=file_content): return
+        file = await attachment.read()
+        with metrics.timed(stage_count, stage_seconds, 'attachment'):
+            if len(file) > INLINE_ATTACHMENT_SIZE:
+                try:
+                    file_content, token = await self.bot.workers.run(jobs.read_attachment, file)
+                except custom_errors.WorkersBusy:  # the token must be checked anyway
+                    file_content, token = jobs.read_attachment(file)
+                except custom_errors.WorkerTimeout:
+                    return self.bot.logger.warning(f'The attachment {attachment.filename} ({len(file)} bytes) could not be read in time.')
+            else:
+                file_content, token = jobs.read_attachment(file)
+        if file_content is None: return
+
+        if await self.token_revoke(message, token=token or False): return
 
         await message.add_reaction('🔄')
-        try: __, user = await self.bot.wait_for('reaction_add', check=lambda react, usr: not usr.bot and react.message.id == message.id and str(react.emoji) == '🔄', timeout=600)
+        try: __, user = await self.bot.reaction_router.wait_for(message.id, emojis=['🔄'], timeout=600)
         except asyncio.TimeoutError: return
         finally: await message.clear_reactions()
 
@@ -69,11 +130,11 @@ class Miscellaneous(commands.Cog):
                                                     _("Click on the correspondant reaction, or send a message with the extension (`.js`, `.py`...)\n\n") +
                                                     f"{' '.join(references.keys())}"), mention_author=False)
 
-            task = self.bot.loop.create_task(add_reactions(response_message, references.keys()))
+            seeding = self.bot.reaction_seeder.seed(response_message, references.keys())
 
             done, pending = await asyncio.wait([
                 self.bot.wait_for('message', timeout=120, check=lambda msg: msg.author.id == user.id and msg.channel.id == response_message.channel.id and len(msg.content) < 7 and msg.content.startswith('.')),
-                self.bot.wait_for('reaction_add', timeout=120, check=lambda react, usr: usr.id == user.id and str(react.emoji) in references.keys())
+                self.bot.reaction_router.wait_for(response_message.id, user_id=user.id, emojis=references.keys(), timeout=120)
             ], return_when=asyncio.FIRST_COMPLETED)
 
             try:
@@ -84,7 +145,7 @@ class Miscellaneous(commands.Cog):
                     file_name = f"code{stuff.content}"
             except asyncio.TimeoutError: return
             finally:
-                task.cancel()
+                seeding.cancel()
                 await response_message.clear_reactions()
                 for future in done:
                     future.exception()
@@ -94,33 +155,34 @@ class Miscellaneous(commands.Cog):
             try:
                 json_response = await create_new_gist(os.getenv('GIST_TOKEN'), file_name, file_content)
                 assert json_response.get('html_url')
-            except: return await message.channel.send(_('An error occurred.'), delete_after=5)
+            except: return self.bot.expiry_wheel.delete(await message.channel.send(_('An error occurred.')), 5)
 
         if not response_message:
             await message.reply(content=_("A gist has been created :\n") + f"<{json_response['html_url']}>", mention_author=False)
         else:
             await response_message.edit(content=_("A gist has been created :\n") + f"<{json_response['html_url']}>")
 
-    async def token_revoke(self, message, attach_content=None):
-        if attach_content:
-            match = self.re_token.search(attach_content)
-        else:
-            match = self.re_token.search(message.content)
-        if not match: return
+    async def token_revoke(self, message, token=None):
+        """token : the token found in an attachment (False if none), None to scan the message content."""
+        if token is None:
+            with metrics.timed(stage_count, stage_seconds, 'token_scan'):
+                token = jobs.find_token(message.content)
+        if not token: return
 
         headers = {
-            "Authorization": f"Bot {match.group(0)}"
+            "Authorization": f"Bot {token}"
         }
-        url = "https://discord.com/api/v8/users/@me"
+        url = f"{DISCORD_API_URL}/users/@me"
         async with aiohttp.ClientSession(headers=headers) as session:
             async with session.get(url=url) as response:
                 if response.status == 200:
                     await message.delete()
+                    await self.bot.set_actual_language(message.author)
                     await message.channel.send((_("**{message.author.mention} you just sent a valid bot token.**\n").format(message=message) +
                                                 _("This one will be revoked, but be careful and check that it has been successfully reset on the **dev portal**.\n") +
                                                 "<https://discord.com/developers/applications>"), allowed_mentions=discord.AllowedMentions.all())
 
-                    await create_new_gist(os.getenv('GIST_TOKEN'), 'token revoke', match.group(0))
+                    await create_new_gist(os.getenv('GIST_TOKEN'), 'token revoke', token)
                     return True
 
 
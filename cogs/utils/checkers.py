@@ -5,10 +5,11 @@ from ..utils import custom_errors
 
 
 def authorized_channels_check(ctx):
-    if ctx.channel.id in ctx.bot.authorized_channels_id:
+    config = ctx.bot.get_guild_config(ctx.guild)
+    if ctx.channel.id in config.authorized_channels:
         return True
 
-    raise custom_errors.NotAuthorizedChannels(ctx.bot.authorized_channels_id)
+    raise custom_errors.NotAuthorizedChannels(config.authorized_channels_id)
 
 
 def authorized_channels():
@@ -17,8 +18,8 @@ def authorized_channels():
 
 def is_high_staff():
     async def inner(ctx):
-        member: discord.Member = auth if isinstance(auth := ctx.author, discord.Member) else ctx.bot.get_guild(ctx.bot.bug_center_id).get_member(ctx.author.id)
-        allowed_roles_ids = [value for key, value in ctx.bot.staff_roles.items() if key in ['administrator', 'assistant', 'depister', 'brillant']]
+        member: discord.Member = auth if isinstance(auth := ctx.author, discord.Member) else await ctx.bot.fetch_bug_center_member(ctx.author.id)
+        allowed_roles_ids = ctx.bot.get_guild_config(member.guild).high_staff_roles
         if discord.utils.find(lambda r: r.id in allowed_roles_ids, member.roles) or member.permissions_in(ctx.channel).administrator:
             return True
         raise custom_errors.NotAuthorizedRoles(allowed_roles_ids)
@@ -0,0 +1,95 @@
+"""
+Code blocks parsing in one pass, without regex backtracking (long unterminated messages made the old patterns quadratic).
+The parsers return the spans of the language and of the code, the strings are only sliced when they are read.
+"""
+import re
+
+FENCE = '```'
+RE_SPACE = re.compile(r'\s')
+RE_NON_SPACE = re.compile(r'\S')
+
+
+class CodeBlock:
+    __slots__ = ('text', 'language_span', 'body_span')
+
+    def __init__(self, text: str, language_span, body_span):
+        self.text = text
+        self.language_span = language_span  # (start, end) or None
+        self.body_span = body_span  # (start, end)
+
+    @property
+    def language(self) -> str:
+        return self.text[self.language_span[0]:self.language_span[1]] if self.language_span else None
+
+    @property
+    def body(self) -> str:
+        return self.text[self.body_span[0]:self.body_span[1]]
+
+    def __repr__(self):
+        return f'<CodeBlock language={self.language!r} body_span={self.body_span}>'
+
+
+def find_code_block(text: str):
+    """
+    The first fence, an optional language line, then the code up to the last fence. The code can't be blank.
+    Same results as the former r'```(?:(\\S*)\\n)?(\\s*\\S[\\S\\s]*)```'.
+    """
+    opening = text.find(FENCE)
+    while opening != -1:
+        start = opening + len(FENCE)
+        closing = text.rfind(FENCE, start)
+        if closing == -1:
+            return None
+
+        space = RE_SPACE.search(text, start, closing)
+        if space and space.group() == '\n' and RE_NON_SPACE.search(text, space.end(), closing):
+            return CodeBlock(text, (start, space.start()), (space.end(), closing))
+        if RE_NON_SPACE.search(text, start, closing):
+            return CodeBlock(text, None, (start, closing))
+
+        opening = text.find(FENCE, opening + 1)  # only whitespaces and backticks until the last fence
+    return None
+
+
+def find_participation(text: str):
+    """
+    A language and the code, in a code block or not : "```py\\ncode```", "```py code```" or "py code".
+    Same results as the former r'(```)?(?:(\\S*)\\s)(\\s*\\S[\\S\\s]*)(?(1)```|)'.
+    """
+    space = RE_SPACE.search(text)
+    if not space:
+        return None
+
+    if text.startswith(FENCE):
+        closing = text.rfind(FENCE, space.end())
+        if closing != -1 and RE_NON_SPACE.search(text, space.end(), closing):
+            return CodeBlock(text, (len(FENCE), space.start()), (space.end(), closing))
+
+    if RE_NON_SPACE.search(text, space.end()):
+        return CodeBlock(text, (0, space.start()), (space.end(), len(text)))
+    return None
+
+
+def number_lines(text: str, start: int = 0, end: int = None, budget: int = 1950, overflow: str = '\netc...') -> str:
+    """
+    Prefix the lines of text[start:end] with their number. The lines after the budget (in characters) aren't numbered,
+    the result is cut at budget characters and ends with overflow.
+    """
+    end = len(text) if end is None else end
+    lines = []
+    size = -1  # the first line has no separator
+    number = 0
+    while start < end:
+        newline = text.find('\n', start, end)
+        if newline == -1:
+            newline = end
+
+        line = f'{number:>3} | {text[start:newline]}'
+        lines.append(line)
+        size += len(line) + 1
+        if size > budget:
+            return '\n'.join(lines)[:budget] + overflow
+
+        start = newline + 1
+        number += 1
+    return '\n'.join(lines)
@@ -0,0 +1,35 @@
+"""JSON encoding and decoding, with orjson when it is installed (pip install orjson), the stdlib json otherwise."""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+if orjson:
+    loads = orjson.loads  # str or bytes
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    dumpb = orjson.dumps
+else:
+    loads = json.loads  # str or bytes (the encoding is detected)
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+    def dumpb(obj) -> bytes:
+        return dumps(obj).encode()
+
+
+def load(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+async def read_json(response):
+    """The JSON body of an aiohttp response, parsed from the bytes (response.json() decodes them to a str first)."""
+    return loads(await response.read())
@@ -0,0 +1,13 @@
+from discord.ext import commands
+
+
+class HelpCenterContext(commands.Context):
+    async def send(self, content=None, *, delete_after=None, wait=True, **kwargs):
+        """
+        delete_after goes through the expiry wheel and the outbox (bulk deletes) instead of a task per message.
+        wait is for the commands also run as slash commands (InteractionContext.send), the message is always returned here.
+        """
+        message = await super().send(content, **kwargs)
+        if delete_after is not None:
+            self.bot.expiry_wheel.delete(message, delete_after)
+        return message
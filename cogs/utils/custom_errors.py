@@ -19,3 +19,13 @@ class NotAuthorizedRoles(errors.CheckFailure):
 
 class NotInBugCenter(errors.CommandError):
     pass
+
+
+class WorkersBusy(errors.CommandError):
+    def __init__(self):
+        super().__init__('The bot is overloaded, try again in a few seconds.')
+
+
+class WorkerTimeout(errors.CommandError):
+    def __init__(self):
+        super().__init__('This took too long, try again later.')
@@ -0,0 +1,79 @@
+import sqlite3
+import hashlib
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+ARCHIVE_PATH = 'ressources/event_archive.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    stopped_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS participations (
+    event_id INTEGER NOT NULL REFERENCES events(id),
+    user_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    code_hash BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS participations_user ON participations(user_id);
+CREATE INDEX IF NOT EXISTS participations_event ON participations(event_id, length, date);
+CREATE UNIQUE INDEX IF NOT EXISTS events_unique ON events(name, started_at);  -- an event is archived once
+"""
+
+
+def hash_code(code: str) -> bytes:
+    return hashlib.sha1(code.encode('utf-8')).digest()
+
+
+class EventArchive:
+    """Store the results of the ended events, to query them without crawling the channels history."""
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self):
+        """A connection closed at the end, in a transaction (committed, or rolled back on an error)."""
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            yield connection
+
+    def archive(self, name: str, started_at: datetime, participations) -> int:
+        """
+        participations is an iterable of (user_id, language, length, date, code).
+        An event already archived (same name and start) is kept as is, its id is returned.
+        """
+        with self.connect() as connection:
+            cursor = connection.execute('INSERT OR IGNORE INTO events (name, started_at, stopped_at) VALUES (?, ?, ?)',
+                                        (name, started_at.isoformat(), datetime.now().isoformat()))
+            if not cursor.rowcount:
+                return connection.execute('SELECT id FROM events WHERE name = ? AND started_at = ?', (name, started_at.isoformat())).fetchone()[0]
+
+            event_id = cursor.lastrowid
+            connection.executemany('INSERT INTO participations VALUES (?, ?, ?, ?, ?, ?)',
+                                   ((event_id, user_id, language, length, date.isoformat(), hash_code(code))
+                                    for user_id, language, length, date, code in participations))
+        return event_id
+
+    def user_results(self, user_id: int, limit: int = 10) -> list:
+        """Return (event name, stopped_at, language, length, global rank, language rank, participants), best ranks first."""
+        query = """
+        SELECT name, stopped_at, language, length, global_rank, language_rank, participants FROM (
+            SELECT event_id, user_id, language, length,
+                   RANK() OVER (PARTITION BY event_id ORDER BY length, date) AS global_rank,
+                   RANK() OVER (PARTITION BY event_id, language ORDER BY length, date) AS language_rank,
+                   COUNT(*) OVER (PARTITION BY event_id) AS participants
+            FROM participations
+        ) JOIN events ON events.id = event_id
+        WHERE user_id = ?
+        ORDER BY global_rank, language_rank, stopped_at DESC
+        LIMIT ?
+        """
+        with self.connect() as connection:
+            return connection.execute(query, (user_id, limit)).fetchall()
@@ -0,0 +1,91 @@
+import asyncio
+import math
+
+DELETE = 'delete'
+REMOVE_REACTION = 'remove_reaction'
+CALLBACK = 'callback'
+
+
+class Expiring:
+    __slots__ = ('action', 'message', 'emoji', 'callback', 'rounds', 'cancelled')
+
+    def __init__(self, action, message=None, emoji=None, callback=None):
+        self.action = action
+        self.message = message
+        self.emoji = emoji
+        self.callback = callback  # also called when a message action expires
+        self.rounds = 0
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class ExpiryWheel:
+    """
+    Hashed timer wheel for the interactive messages of the bot.
+    A single task advances the wheel every `tick` seconds, and the records expired during the same tick
+    are cleaned up together (the deletions go through the outbox, grouped per channel to use bulk deletes).
+    """
+
+    def __init__(self, bot, *, tick: float = 1.0, size: int = 256):
+        self.bot = bot
+        self.tick = tick
+        self.slots = [[] for __ in range(size)]
+        self.cursor = 0
+        self.task: asyncio.Task = None
+
+    def __len__(self):
+        return sum(not record.cancelled for slot in self.slots for record in slot)
+
+    def delete(self, message, delay: float = 0, *, callback=None) -> Expiring:
+        return self.schedule(delay, Expiring(DELETE, message=message, callback=callback))
+
+    def remove_reaction(self, message, emoji, delay: float, *, callback=None) -> Expiring:
+        return self.schedule(delay, Expiring(REMOVE_REACTION, message=message, emoji=emoji, callback=callback))
+
+    def call_later(self, delay: float, callback) -> Expiring:
+        return self.schedule(delay, Expiring(CALLBACK, callback=callback))
+
+    def schedule(self, delay: float, record: Expiring) -> Expiring:
+        ticks = max(1, math.ceil(delay / self.tick))
+        record.rounds = (ticks - 1) // len(self.slots)
+        self.slots[(self.cursor + ticks) % len(self.slots)].append(record)
+
+        if self.task is None:
+            self.task = self.bot.loop.create_task(self.run())
+        return record
+
+    async def run(self):
+        next_tick = self.bot.loop.time()
+        while True:
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - self.bot.loop.time()))
+
+            self.cursor = (self.cursor + 1) % len(self.slots)
+            expired, remaining = [], []
+            for record in self.slots[self.cursor]:
+                if record.cancelled: continue
+                if record.rounds:
+                    record.rounds -= 1
+                    remaining.append(record)
+                else:
+                    expired.append(record)
+            self.slots[self.cursor] = remaining
+
+            if expired:
+                self.bot.loop.create_task(self.expire(expired))
+
+    async def expire(self, records):
+        coroutines = []
+
+        for record in records:
+            if record.callback:
+                try: record.callback()
+                except Exception as e: self.bot.logger.error(f'An expiry callback failed : {e}')
+            if record.action == DELETE:
+                self.bot.outbox.delete(record.message)
+            elif record.action == REMOVE_REACTION:
+                coroutines.append(record.message.remove_reaction(record.emoji, self.bot.user))
+
+        await asyncio.gather(*coroutines, return_exceptions=True)
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+from . import codec
+
+HIGH_STAFF = ('administrator', 'assistant', 'depister', 'brillant')
+
+
+class GuildConfig:
+    """The channels and roles of a help guild, with the lookups precomputed (frozensets, dicts)."""
+    __slots__ = ('guild_id', 'name', 'staff_roles', 'high_staff_roles', 'help_channels_id', 'test_channels_id', 'authorized_channels_id',
+                 'test_channels', 'authorized_channels', 'language_roles', 'default_language', 'tracked_roles')
+
+    def __init__(self, guild_id: int, *, name: str = '', staff_roles: dict = None, help_channels: list = (), test_channels: list = (),
+                 language_roles: list = (), default_language: str = 'en_EN'):
+        self.guild_id = guild_id
+        self.name = name
+        self.staff_roles = dict(staff_roles or {})
+        self.high_staff_roles = [role_id for key, role_id in self.staff_roles.items() if key in HIGH_STAFF]
+
+        self.help_channels_id = list(help_channels)
+        self.test_channels_id = list(test_channels)
+        self.authorized_channels_id = self.test_channels_id + self.help_channels_id
+        self.test_channels = frozenset(self.test_channels_id)  # for the lookups, the lists keep the display order
+        self.authorized_channels = frozenset(self.authorized_channels_id)
+
+        self.language_roles = OrderedDict((int(role_id), lang) for role_id, lang in language_roles)  # in order of priority
+        self.default_language = default_language
+        self.tracked_roles = frozenset(self.staff_roles.values()) | frozenset(self.language_roles)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            int(data['guild_id']),
+            name=data.get('name', ''),
+            staff_roles={key: int(role_id) for key, role_id in data.get('staff_roles', {}).items()},
+            help_channels=[int(channel_id) for channel_id in data.get('help_channels', [])],
+            test_channels=[int(channel_id) for channel_id in data.get('test_channels', [])],
+            language_roles=[(int(role_id), lang) for role_id, lang in data.get('language_roles', [])],
+            default_language=data.get('default_language', 'en_EN')
+        )
+
+    def get_language(self, member) -> str:
+        role_ids = {role.id for role in member.roles}
+        return next((lang for role_id, lang in self.language_roles.items() if role_id in role_ids), self.default_language)
+
+
+def load_guild_configs(path: str) -> OrderedDict:
+    """Return {guild id: GuildConfig}, the first guild of the file is the main one (events, DM commands)."""
+    return OrderedDict((config.guild_id, config) for config in map(GuildConfig.from_dict, codec.load(path)))
@@ -5,6 +5,7 @@ import builtins
 import contextvars
 import gettext
 import os.path
+from collections import OrderedDict
 from glob import glob
 
 BASE_DIR = "ressources/"  # change this if you store your files under `src/` or similar
@@ -37,6 +38,72 @@ def use_current_gettext(*args, **kwargs):
     )
 
 
+class LazyString:
+    """A message translated in the current locale each time it is used (formatted, concatenated...), not when it is created."""
+    __slots__ = ('message',)
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return use_current_gettext(self.message)
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+    def __add__(self, other):
+        return str(self) + other
+
+    def __radd__(self, other):
+        return other + str(self)
+
+    def __eq__(self, other):
+        return self.message == (other.message if isinstance(other, LazyString) else other)
+
+    def __hash__(self):
+        return hash(self.message)
+
+    def __bool__(self):
+        return bool(self.message)
+
+    def __repr__(self):
+        return f'<LazyString {self.message!r}>'
+
+    def format(self, *args, **kwargs) -> str:
+        return str(self).format(*args, **kwargs)
+
+
+def lazy_gettext(message: str) -> LazyString:
+    return LazyString(message)
+
+
+def lazy_descriptions(commands) -> None:
+    """
+    The commands descriptions are translated when the extensions are imported (so in LOCALE_DEFAULT, the messages ids),
+    and discord.py requires str in the decorators : they are made lazy once the commands are created.
+    """
+    for command in commands:
+        if isinstance(command.description, str) and command.description:
+            command.description = LazyString(command.description)
+
+
+RENDERED_TEXTS_SIZE = 256  # the keys can contain ids (channels of the errors...), the least recently used texts are dropped
+rendered_texts = OrderedDict()  # {(locale, key): text}, LRU
+
+
+def render_cached(key, render):
+    """Return the static text built by render(), memoized per locale (help listing, usages, error prefixes...)."""
+    cache_key = (current_locale.get(), key)
+    try:
+        rendered_texts.move_to_end(cache_key)
+        return rendered_texts[cache_key]
+    except KeyError:
+        text = rendered_texts[cache_key] = render()
+        if len(rendered_texts) > RENDERED_TEXTS_SIZE:
+            rendered_texts.popitem(last=False)
+        return text
+
+
 current_locale = contextvars.ContextVar('i18n')
 current_locale.set(LOCALE_DEFAULT)
 
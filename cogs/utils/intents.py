@@ -0,0 +1,31 @@
+import discord
+
+# intents needed by each event, the events missing here don't need any intent (on_ready, on_command...)
+EVENT_INTENTS = {
+    'on_guild_join': ('guilds',), 'on_guild_remove': ('guilds',), 'on_guild_update': ('guilds',),
+    'on_guild_channel_create': ('guilds',), 'on_guild_channel_delete': ('guilds',), 'on_guild_channel_update': ('guilds',),
+    'on_guild_role_create': ('guilds',), 'on_guild_role_delete': ('guilds',), 'on_guild_role_update': ('guilds',),
+    'on_member_join': ('members',), 'on_member_remove': ('members',), 'on_member_update': ('members',),
+    'on_member_ban': ('bans',), 'on_member_unban': ('bans',),
+    'on_guild_emojis_update': ('emojis',),
+    'on_guild_integrations_update': ('integrations',),
+    'on_webhooks_update': ('webhooks',),
+    'on_invite_create': ('invites',), 'on_invite_delete': ('invites',),
+    'on_voice_state_update': ('voice_states',),
+    'on_message': ('guild_messages', 'dm_messages'),
+    'on_message_edit': ('guild_messages', 'dm_messages'), 'on_raw_message_edit': ('guild_messages', 'dm_messages'),
+    'on_message_delete': ('guild_messages', 'dm_messages'), 'on_raw_message_delete': ('guild_messages', 'dm_messages'),
+    'on_bulk_message_delete': ('guild_messages',), 'on_raw_bulk_message_delete': ('guild_messages',),
+    'on_reaction_add': ('guild_reactions', 'dm_reactions'), 'on_raw_reaction_add': ('guild_reactions', 'dm_reactions'),
+    'on_reaction_remove': ('guild_reactions', 'dm_reactions'), 'on_raw_reaction_remove': ('guild_reactions', 'dm_reactions'),
+    'on_reaction_clear': ('guild_reactions', 'dm_reactions'), 'on_raw_reaction_clear': ('guild_reactions', 'dm_reactions'),
+    'on_typing': ('guild_typing', 'dm_typing'),
+}
+
+
+def add_event_intents(intents: discord.Intents, events) -> discord.Intents:
+    """Enable in place the intents needed to receive the given events."""
+    for event in events:
+        for flag in EVENT_INTENTS.get(event, ()):
+            setattr(intents, flag, True)
+    return intents
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import discord
+from discord.ext import commands
+from discord.http import Route
+
+from . import metrics, codec
+
+API_URL = 'https://discord.com/api/v8'  # discord.py 1.6 uses v7, the interactions need v8
+
+APPLICATION_COMMAND = 2
+SUB_COMMAND = 1
+RESPONSE_MESSAGE = 4
+RESPONSE_DEFERRED_MESSAGE = 5
+EPHEMERAL = 1 << 6
+
+interaction_duration = metrics.histogram('interaction_duration_seconds', 'Time to handle the slash commands, by command.', ('command',))
+
+
+def route(method: str, path: str, **parameters) -> Route:
+    api_route = Route(method, path, **parameters)
+    api_route.url = API_URL + api_route.url[len(Route.BASE):]
+    return api_route
+
+
+class InteractionContext:
+    """
+    The part of commands.Context used by the cogs, for a slash command (an INTERACTION_CREATE).
+    The first message sent answers the interaction (or replaces the deferred answer), the next ones are follow-ups.
+    """
+
+    def __init__(self, bot, data: dict):
+        self.bot = bot
+        self.id = int(data['id'])
+        self.token = data['token']
+        self.application_id = int(data['application_id'])
+        self.created_at = discord.utils.snowflake_time(self.id)
+        self.message = None  # there is no trigger message
+        self.prefix = '/'
+        self.responded = False
+        self.deferred = False
+        self.command_failed = False
+
+        state = bot._connection
+        self.guild = bot.get_guild(int(data['guild_id'])) if data.get('guild_id') else None
+        if self.guild and 'member' in data:
+            self.author = discord.Member(data=data['member'], guild=self.guild, state=state)
+        else:
+            self.author = state.store_user(data.get('user') or data['member']['user'])
+
+        self.channel = bot.get_channel(int(data['channel_id']))
+        if self.channel is None and self.guild is None:  # DM channel not cached
+            self.channel = discord.DMChannel(me=bot.user, state=state, data={'id': data['channel_id'], 'recipients': [data['user']]})
+
+        self.name = data['data']['name']
+        options = data['data'].get('options', [])
+        self.subcommand = None
+        if options and options[0]['type'] == SUB_COMMAND:
+            self.subcommand, options = options[0]['name'], options[0].get('options', [])
+        self.options = {option['name']: option.get('value') for option in options}
+        self.command = bot.get_command(self.qualified_name)
+
+    @property
+    def qualified_name(self) -> str:
+        return f'{self.name} {self.subcommand}' if self.subcommand else self.name
+
+    async def invoke_command(self, *args, **kwargs) -> None:
+        """
+        Run the prefix command with the same name like Command.invoke (checks, before and after invoke hooks, command events),
+        with the arguments of the slash command. The errors go to on_command_error, wrapped in CommandInvokeError like for a message.
+        """
+        start = time.perf_counter()
+        self.bot.dispatch('command', self)
+        try:
+            if not await self.command.can_run(self):
+                raise commands.CheckFailure(f'The check functions for command {self.qualified_name} failed.')
+            await self.command.call_before_hooks(self)
+            try:
+                await self.command.callback(*((self.command.cog,) if self.command.cog else ()), self, *args, **kwargs)
+            except commands.CommandError:
+                self.command_failed = True
+                raise
+            except asyncio.CancelledError:
+                self.command_failed = True
+                return
+            except Exception as error:
+                self.command_failed = True
+                raise commands.CommandInvokeError(error) from error
+            finally:
+                await self.command.call_after_hooks(self)
+        except commands.CommandError as error:
+            self.bot.dispatch('command_error', self, error)
+        else:
+            self.bot.dispatch('command_completion', self)
+        finally:
+            interaction_duration.observe(time.perf_counter() - start, self.qualified_name)
+
+    async def defer(self, ephemeral: bool = False) -> None:
+        """Acknowledge now ("is thinking..."), for the commands taking more than 3 seconds."""
+        if self.responded or self.deferred: return
+        payload = {'type': RESPONSE_DEFERRED_MESSAGE, 'data': {'flags': EPHEMERAL} if ephemeral else {}}
+        await self.request('POST', '/interactions/{interaction_id}/{interaction_token}/callback', payload)
+        self.deferred = True
+
+    async def send(self, content=None, *, embed=None, file=None, delete_after=None, ephemeral=False, wait=False):
+        """
+        Like discord.Webhook.send, the message is only returned with wait=True (or delete_after) : the first response
+        doesn't return the message, it costs one more request to get it.
+        """
+        payload = {'allowed_mentions': {'parse': []}}
+        if content is not None: payload['content'] = str(content)
+        if embed is not None: payload['embeds'] = [embed.to_dict()]
+        if ephemeral: payload['flags'] = EPHEMERAL
+
+        if not self.responded and file is None and not self.deferred:
+            await self.request('POST', '/interactions/{interaction_id}/{interaction_token}/callback', {'type': RESPONSE_MESSAGE, 'data': payload})
+            data = None
+            if wait or delete_after is not None:
+                data = await self.request('GET', '/webhooks/{application_id}/{interaction_token}/messages/@original')
+        elif not self.responded:  # the files can't be sent in the first response
+            await self.defer(ephemeral)
+            data = await self.request('PATCH', '/webhooks/{application_id}/{interaction_token}/messages/@original', payload, file)
+        else:
+            data = await self.request('POST', '/webhooks/{application_id}/{interaction_token}', payload, file, params={'wait': 'true'})
+        self.responded = True
+        if data is None:
+            return None
+
+        message = self.bot._connection.create_message(channel=self.channel, data=data)
+        if delete_after is not None:
+            self.bot.expiry_wheel.delete(message, delete_after)
+        return message
+
+    async def request(self, method: str, path: str, payload: dict = None, file: discord.File = None, **kwargs):
+        api_route = route(method, path, interaction_id=self.id, application_id=self.application_id, interaction_token=self.token)
+        if file is None:
+            if payload is not None: kwargs['json'] = payload
+            return await self.bot.http.request(api_route, **kwargs)
+
+        form = [{'name': 'payload_json', 'value': codec.dumps(payload)},
+                {'name': 'file', 'value': file.fp, 'filename': file.filename, 'content_type': 'application/octet-stream'}]
+        try:
+            return await self.bot.http.request(api_route, files=[file], form=form, **kwargs)
+        finally:
+            file.close()
@@ -0,0 +1,52 @@
+"""
+The CPU-bound jobs run by the worker processes (see workers.py).
+They are pickled by name, take and return plain data, and this module must stay light to import (no discord).
+"""
+import io
+import re
+
+RE_TOKEN = re.compile(r"[\w\-=]+\.[\w\-=]+\.[\w\-=]+", re.ASCII)
+
+BAR_COLOR = (10 / 255, 100 / 255, 255 / 255, 0.5)
+BAR_EDGE_COLOR = (10 / 255, 100 / 255, 255 / 255, 1.0)
+
+
+def find_token(content: str):
+    """Return the first thing looking like a bot token in content, or None."""
+    if content.count('.') < 2:  # a token has two dots
+        return None
+    match = RE_TOKEN.search(content)
+    return match.group(0) if match else None
+
+
+def read_attachment(data: bytes) -> (str, str):
+    """Return (text, token) for a text attachment, (None, None) for a binary file or a file that isn't UTF-8."""
+    import filetype  # imported on the first attachment, to start faster
+
+    if filetype.guess(data) is not None:
+        return None, None
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None, None
+    return text, find_token(text)
+
+
+def render_bar_chart(counts: dict, title: str) -> bytes:
+    """A PNG bar chart of {label: count}."""
+    import matplotlib
+    matplotlib.use('Agg')  # no display in the workers
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import StrMethodFormatter
+
+    fig, ax = plt.subplots()
+    ax.bar(counts.keys(), counts.values(), color=BAR_COLOR, edgecolor=BAR_EDGE_COLOR, linewidth=5)
+
+    ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.0f}'))  # No decimal places
+    ax.set_yticks(range(1, max(counts.values()) + 1))
+    ax.set_title(title)
+    buff = io.BytesIO()
+    fig.savefig(buff)
+    plt.close(fig)
+
+    return buff.getvalue()
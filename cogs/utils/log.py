@@ -0,0 +1,80 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+from . import codec
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return codec.dumps(entry)
+
+
+class RepeatFilter(logging.Filter):
+    """Let an identical warning (or error) pass once per `interval` seconds, the next one tells how many were dropped."""
+
+    def __init__(self, interval: float = 60):
+        super().__init__()
+        self.interval = interval
+        self.last_seen = {}  # {(logger, level, message): [time of the last record let through, records dropped since]}
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        last_seen = self.last_seen.get(key)
+        if last_seen and now - last_seen[0] < self.interval:
+            last_seen[1] += 1
+            return False
+
+        if last_seen and last_seen[1]:
+            record.msg, record.args = f'{record.getMessage()} (repeated {last_seen[1]} times)', None
+        self.last_seen[key] = [now, 0]
+
+        if len(self.last_seen) > 1000:  # forget the old messages
+            self.last_seen = {key: value for key, value in self.last_seen.items() if now - value[0] < self.interval}
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Only resolve the message in the calling thread, the formatting (tracebacks, JSON) is done by the listener."""
+
+    def prepare(self, record):
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+
+def setup_logging(level: int = logging.WARNING, stream=sys.stderr) -> logging.handlers.QueueListener:
+    """
+    The event loop only enqueues the records, a background thread formats and writes them.
+    Return the listener, to stop it (and flush the queue) when the bot stops.
+    """
+    log_queue = queue.SimpleQueue()
+
+    handler = LazyQueueHandler(log_queue)
+    handler.addFilter(RepeatFilter())
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,149 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+REGISTRY = {}  # {name: metric}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(names, values, **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ''
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    """A monotonic value, optionally split by labels (`counter.inc('MESSAGE_CREATE')`)."""
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = defaultdict(float)  # {label values: value}
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        self.values[label_values] += amount
+
+    def get(self, *label_values) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield self.name, format_labels(self.labels, label_values), value
+
+
+class Gauge:
+    """A value that can go up and down, or computed by a function when the metrics are collected."""
+    type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, function=None):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self):
+        yield self.name, '', self.function() if self.function else self.value
+
+
+class Histogram:
+    """Distribution of observed values (in seconds for the latencies), split by labels."""
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}  # {label values: [count per bucket (+Inf last), sum]}
+
+    def observe(self, value: float, *label_values) -> None:
+        counts = self.values.get(label_values)
+        if counts is None:
+            counts = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        counts[0][bisect_left(self.buckets, value)] += 1
+        counts[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def quantile(self, q: float, *label_values) -> float:
+        """Estimate a quantile with the upper bound of its bucket (inf if it is in the last one)."""
+        counts, __ = self.values.get(label_values, ([0], 0.0))
+        total, rank = sum(counts), q * sum(counts)
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            if total and cumulative >= rank:
+                return bound
+        return 0.0
+
+    def samples(self):
+        for label_values, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', format_labels(self.labels, label_values, le='+Inf' if bound == float('inf') else bound), cumulative
+            yield f'{self.name}_sum', format_labels(self.labels, label_values), total
+            yield f'{self.name}_count', format_labels(self.labels, label_values), cumulative
+
+
+def counter(name: str, documentation: str, labels: tuple = ()) -> Counter:
+    return REGISTRY.setdefault(name, Counter(name, documentation, labels))
+
+
+def gauge(name: str, documentation: str, function=None) -> Gauge:
+    metric = REGISTRY.setdefault(name, Gauge(name, documentation))
+    metric.function = function or metric.function
+    return metric
+
+
+def histogram(name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.setdefault(name, Histogram(name, documentation, labels, buckets))
+
+
+@contextmanager
+def timed(count: Counter, seconds: Counter, *label_values):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        count.inc(*label_values)
+        seconds.inc(*label_values, amount=time.perf_counter() - start)
+
+
+def render() -> str:
+    """Return every metric in the Prometheus text format."""
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.extend(f'{name}{labels} {value}' for name, labels, value in metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+async def start_http_server(port: int, host: str = '127.0.0.1'):
+    from aiohttp import web  # the endpoint is optional
+
+    async def handle(request):
+        return web.Response(text=render(), content_type='text/plain', charset='utf-8', headers={'X-Prometheus-Format': '0.0.4'})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
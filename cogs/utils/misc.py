@@ -1,68 +1,34 @@
-import asyncio
+import sys
 import aiohttp
-import json
 
-from schema import Schema, Or, And, Use, Optional, Regex
+from . import metrics, codec
+
 import discord
 
-text_or_list = Schema(Or(str, And(list, Use(lambda iterable: '\n'.join(iterable)))))
-
-embed_shema = Schema({
-    'title': str,
-    'description': text_or_list,
-    Optional('image'): {
-        'url': str
-    },
-    Optional('fields'): [
-        {
-            'name': str,
-            'value': text_or_list,
-            Optional('inline'): bool
-        }
-    ]
-})
-
-inner_tag_shema = Schema({
-    Optional('lang'): Regex(r'[a-z]{2}_[A-Z]{2}'),
-    'name': str,
-    Optional('aliases'): list,
-    'description': str,
-    'response': Or({'embed': embed_shema}, {
-        'choices': [
-            {
-                "choice_name": str,
-                "embed": embed_shema
-            }
-        ]
-    })
-})
-
-tag_shema = Schema(Or([inner_tag_shema], inner_tag_shema))
-
-
-async def add_reactions(message, reactions) -> None:
-    for react in reactions:
-        await message.add_reaction(react)
+GIST_API_URL = 'https://api.github.com'
+PISTON_API_URL = 'https://emkc.org/api/v1/piston'
+
+external_duration = metrics.histogram('external_request_duration_seconds', 'Piston and GitHub requests duration, by service.', ('service',))
 
 
 async def delete_with_emote(ctx, bot_message):
+    """Let the author delete the response for 120 seconds, without keeping a coroutine alive."""
     await bot_message.add_reaction("🗑️")
 
-    try:
-        await ctx.bot.wait_for("reaction_add", timeout=120,
-                               check=lambda react, usr: str(react.emoji) == "🗑️" and react.message.id == bot_message.id and usr.id == ctx.author.id)
-    except asyncio.TimeoutError:
-        try: await bot_message.remove_reaction("🗑️", ctx.me)
-        except: pass
-    else:
-        try:
-            await bot_message.delete()
-            await ctx.message.delete()
-        except: pass
+    future = ctx.bot.reaction_router.register(bot_message.id, user_id=ctx.author.id, emojis=["🗑️"])
+    expiring = ctx.bot.expiry_wheel.remove_reaction(bot_message, "🗑️", 120, callback=future.cancel)
+
+    def on_reaction(future):
+        if future.cancelled(): return
+        expiring.cancel()
+        ctx.bot.outbox.delete(bot_message)
+        if ctx.message: ctx.bot.outbox.delete(ctx.message)  # no trigger message for a slash command
+
+    future.add_done_callback(on_reaction)
 
 
 async def create_new_gist(token, file_name, file_content):
-    url = 'https://api.github.com/gists'
+    url = f'{GIST_API_URL}/gists'
     header = {
         'Authorization': f'token {token}'
     }
@@ -70,13 +36,20 @@ async def create_new_gist(token, file_name, file_content):
         'files': {file_name: {'content': file_content}},
         'public': True
     }
-    async with aiohttp.ClientSession(headers=header) as session:
-        async with session.post(url=url, json=payload) as response:
-            return json.loads(await response.text())
+    with external_duration.time('gist'):
+        async with aiohttp.ClientSession(headers=header, json_serialize=codec.dumps) as session:
+            async with session.post(url=url, json=payload) as response:
+                return await codec.read_json(response)
+
+
+async def get_piston_versions() -> list:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url=f'{PISTON_API_URL}/versions') as response:
+            return await codec.read_json(response)
 
 
 async def execute_piston_code(language, source_code, *, stdin: list=None, args: list=None):
-    url = "https://emkc.org/api/v1/piston/execute"
+    url = f"{PISTON_API_URL}/execute"
     payload = {
         'language': language,
         'source': source_code
@@ -86,12 +59,20 @@ async def execute_piston_code(language, source_code, *, stdin: list=None, args:
     if args:
         payload['args'] = args
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url=url, json=payload) as response:
-            json_response: dict = await response.json()
-            if response.status == 200:
-                return json_response
-            raise Exception(json_response.get('message', 'unknown error'))
+    with external_duration.time('piston'):
+        async with aiohttp.ClientSession(json_serialize=codec.dumps) as session:
+            async with session.post(url=url, json=payload) as response:
+                json_response: dict = await codec.read_json(response)
+    if response.status == 200:
+        return json_response
+    raise Exception(json_response.get('message', 'unknown error'))
+
+
+def max_rss_mb():
+    try: import resource  # only available on Unix
+    except ImportError: return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 ** 2 if sys.platform == 'darwin' else max_rss / 1024  # bytes on macOS, kilobytes elsewhere
 
 
 class Color:
@@ -0,0 +1,73 @@
+import asyncio
+
+import discord
+
+from . import metrics
+
+outbox_items = metrics.counter('outbox_items_total', 'Deletions and notices given to the outbox, by kind.', ('kind',))
+outbox_requests = metrics.counter('outbox_requests_total', 'REST calls made by the outbox, by kind.', ('kind',))
+
+
+class Outbox:
+    """
+    Batch the outgoing REST calls over a short window :
+    the deletions are grouped per channel (bulk deletes), the notices for a user in a channel are merged in one message.
+    """
+
+    def __init__(self, bot, *, window: float = 0.5):
+        self.bot = bot
+        self.window = window
+        self.deletions = {}  # {channel id: (channel, {message id: message})}
+        self.notices = {}  # {(channel id, user id): (channel, [text, ...], build, delete_after)}
+
+    def delete(self, message) -> None:
+        outbox_items.inc('delete')
+        if (batch := self.deletions.get(message.channel.id)) is None:
+            batch = self.deletions[message.channel.id] = (message.channel, {})
+            self.bot.loop.call_later(self.window, self.flush_deletions, message.channel.id)
+        batch[1][message.id] = message
+
+    def flush_deletions(self, channel_id) -> None:
+        channel, messages = self.deletions.pop(channel_id)
+        self.bot.loop.create_task(self.delete_messages(channel, list(messages.values())))
+
+    async def delete_messages(self, channel, messages) -> None:
+        remaining = messages  # deleted one by one
+        if isinstance(channel, discord.TextChannel) and len(messages) > 1:
+            remaining = []
+            for i in range(0, len(messages), 100):  # 100 messages max per bulk delete
+                outbox_requests.inc('bulk_delete')
+                try: await channel.delete_messages(messages[i:i+100])
+                except discord.HTTPException: remaining += messages[i:i+100]  # missing permissions or messages older than 14 days
+
+        if not remaining:
+            return
+        outbox_requests.inc('delete', amount=len(remaining))
+        results = await asyncio.gather(*(message.delete() for message in remaining), return_exceptions=True)
+        errors = [error for error in results if isinstance(error, Exception) and not isinstance(error, discord.NotFound)]  # NotFound : already deleted
+        if errors:
+            self.bot.logger.warning(f'{len(errors)} messages could not be deleted in {channel} : {errors[0]}')
+
+    def send_notice(self, channel, user_id: int, text: str, *, build=None, delete_after: float = None) -> None:
+        """Send text (or the embed returned by build(text)) after the window, with the other notices of the user in the channel."""
+        outbox_items.inc('notice')
+        key = (channel.id, user_id)
+        if (batch := self.notices.get(key)) is None:
+            batch = self.notices[key] = (channel, [], build, delete_after)
+            self.bot.loop.call_later(self.window, self.flush_notices, key)
+        if text not in batch[1]:  # the same error repeated is only shown once
+            batch[1].append(text)
+
+    def flush_notices(self, key) -> None:
+        channel, texts, build, delete_after = self.notices.pop(key)
+        self.bot.loop.create_task(self.send(channel, '\n\n'.join(texts)[:2000], build, delete_after))
+
+    async def send(self, channel, text: str, build, delete_after: float) -> None:
+        outbox_requests.inc('send')
+        try:
+            message = await (channel.send(embed=build(text)) if build else channel.send(text))
+        except discord.HTTPException as e:
+            return self.bot.logger.warning(f'A notice could not be sent : {e}')
+
+        if delete_after is not None:
+            self.bot.expiry_wheel.delete(message, delete_after)
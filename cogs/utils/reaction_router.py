@@ -0,0 +1,66 @@
+import asyncio
+
+
+class ReactionWaiter:
+    __slots__ = ('future', 'user_id', 'emojis')
+
+    def __init__(self, future, user_id, emojis):
+        self.future = future
+        self.user_id = user_id
+        self.emojis = emojis
+
+    def match(self, emoji, user_id) -> bool:
+        return (self.user_id is None or self.user_id == user_id) and (self.emojis is None or emoji in self.emojis)
+
+
+class ReactionRouter:
+    """
+    Replace `bot.wait_for('reaction_add', check=...)` for reactions on a known message.
+    The waiters are indexed by message id, so a reaction only checks the waiters of its own message.
+    Reactions added by bots are ignored.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.waiters = {}  # {message id: [ReactionWaiter, ...]}
+        bot.add_listener(self.on_reaction_add)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(waiters) for waiters in self.waiters.values())
+
+    def register(self, message_id: int, *, user_id: int = None, emojis=None) -> asyncio.Future:
+        """Return a future resolved with (reaction, user), the waiter is removed when the future is done or cancelled."""
+        waiter = ReactionWaiter(self.bot.loop.create_future(), user_id, frozenset(emojis) if emojis is not None else None)
+        self.waiters.setdefault(message_id, []).append(waiter)
+        waiter.future.add_done_callback(lambda __: self.remove(message_id, waiter))
+        return waiter.future
+
+    async def wait_for(self, message_id: int, *, user_id: int = None, emojis=None, timeout: float = None):
+        """Return (reaction, user) like `bot.wait_for('reaction_add')`, raise asyncio.TimeoutError after timeout."""
+        future = self.register(message_id, user_id=user_id, emojis=emojis)
+        expiring = None
+        if timeout is not None:
+            expiring = self.bot.expiry_wheel.call_later(timeout, lambda: future.done() or future.set_exception(asyncio.TimeoutError()))
+
+        try:
+            return await future
+        finally:
+            if expiring: expiring.cancel()
+
+    def remove(self, message_id, waiter) -> None:
+        waiters = self.waiters.get(message_id)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self.waiters[message_id]
+
+    async def on_reaction_add(self, reaction, user):
+        if user.bot: return
+        waiters = self.waiters.get(reaction.message.id)
+        if not waiters: return
+
+        emoji = str(reaction.emoji)
+        for waiter in waiters:
+            if not waiter.future.done() and waiter.match(emoji, user.id):
+                waiter.future.set_result((reaction, user))
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from collections import deque
+
+import discord
+
+from . import metrics
+
+menu_seconds = metrics.histogram('reaction_menu_seconds', 'Time to add all the reactions of a menu (time to full menu).')
+reactions_seeded = metrics.counter('reactions_seeded_total', 'Reactions of the menus, added or skipped (menu answered before).', ('result',))
+
+
+class Seeding:
+    __slots__ = ('message', 'emojis', 'added', 'started_at', 'cancelled')
+
+    def __init__(self, message, emojis):
+        self.message = message
+        self.emojis = emojis
+        self.added = 0
+        self.started_at = time.perf_counter()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """The reactions not sent yet are skipped."""
+        self.cancelled = True
+
+
+class ReactionSeeder:
+    """
+    Add the reactions of the menus with one queue per channel (Discord's reaction bucket is per channel).
+    The adds are still serialized by discord.py's bucket lock, like before : what the queue brings is the order (the menus
+    are completed one after the other, first opened first) and the cancellation (the reactions of an answered menu are skipped).
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.queues = {}  # {channel id: deque([(Seeding, emoji), ...])}
+        self.workers = {}  # {channel id: asyncio.Task}
+
+    def seed(self, message, emojis) -> Seeding:
+        seeding = Seeding(message, list(emojis))
+        channel_id = message.channel.id
+        self.queues.setdefault(channel_id, deque()).extend((seeding, emoji) for emoji in seeding.emojis)
+        if channel_id not in self.workers:
+            self.workers[channel_id] = self.bot.loop.create_task(self.run(channel_id))
+        return seeding
+
+    async def run(self, channel_id) -> None:
+        queue = self.queues[channel_id]
+        try:
+            while queue:
+                seeding, emoji = queue.popleft()
+                if seeding.cancelled:
+                    reactions_seeded.inc('skipped')
+                    continue
+                await self.add(seeding, emoji)
+        finally:  # the next seed of the channel starts a new worker
+            del self.queues[channel_id], self.workers[channel_id]
+
+    async def add(self, seeding: Seeding, emoji: str) -> None:
+        try:  # the custom emojis are written <:name:id>, the API wants name:id
+            await self.bot.http.add_reaction(seeding.message.channel.id, seeding.message.id, emoji.strip('<>'))
+        except discord.HTTPException:  # message deleted, missing permissions...
+            return seeding.cancel()
+        except Exception as e:
+            self.bot.logger.error(f'The reactions of the message {seeding.message.id} could not be added : {e!r}')
+            return seeding.cancel()
+
+        reactions_seeded.inc('added')
+        seeding.added += 1
+        if seeding.added == len(seeding.emojis):
+            menu_seconds.observe(time.perf_counter() - seeding.started_at)
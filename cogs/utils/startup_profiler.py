@@ -0,0 +1,58 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Measure the imports, the extensions setup, the time to on_ready and the time to the first command served."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.imports = []  # [(module name, seconds, depth)], the time of a module includes its own imports
+        self.steps = []  # [(label, seconds)]
+        self.milestones = {}  # {label: seconds since the start}
+        self._depth = 0
+        self._original_import = None
+
+    def install(self) -> None:
+        self._original_import = builtins.__import__
+
+        def profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:  # relative imports are resolved by the parent package
+                return self._original_import(name, globals, locals, fromlist, level)
+
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                self.imports.append((name, time.perf_counter() - start, self._depth))
+
+        builtins.__import__ = profiled_import
+
+    def uninstall(self) -> None:
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def measure(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((label, time.perf_counter() - start))
+
+    def milestone(self, label: str) -> None:
+        self.milestones.setdefault(label, time.perf_counter() - self.start)
+
+    def report(self, limit: int = 15) -> str:
+        lines = ['Startup profile :', f"{'slowest imports (with their own imports)':<50}{'ms':>10}"]
+        lines += [f"{'  ' * depth + name:<50}{seconds * 1000:>10.1f}" for name, seconds, depth in sorted(self.imports, key=lambda i: -i[1])[:limit]]
+        lines += ['', f"{'step':<50}{'ms':>10}"]
+        lines += [f"{label:<50}{seconds * 1000:>10.1f}" for label, seconds in self.steps]
+        lines += ['', f"{'milestone (since the start)':<50}{'ms':>10}"]
+        lines += [f"{label:<50}{seconds * 1000:>10.1f}" for label, seconds in self.milestones.items()]
+        return '\n'.join(lines)
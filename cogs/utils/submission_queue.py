@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timedelta
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUE_PATH = 'ressources/submissions.sqlite3'
+FINISHED_RETENTION = timedelta(days=1)  # the finished submissions are kept a day, then deleted
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    code TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions(status, id);
+"""
+
+Submission = namedtuple('Submission', ('id', 'user_id', 'language', 'code'))
+
+
+class SubmissionQueue:
+    """
+    Persistent queue of the event participations waiting for their tests.
+    A user has at most one pending submission per language (a new one replaces it) and one running submission,
+    so a user can't monopolize the workers.
+    The methods block on the disk : call them in the executor of the queue (one thread, the calls are serialized).
+    """
+
+    def __init__(self, path=QUEUE_PATH):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='submissions')
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)  # autocommit, every change is durable
+        self.connection.executescript(SCHEMA)
+        self.connection.execute("UPDATE submissions SET status = 'pending' WHERE status = 'running'")  # interrupted by a restart
+        self.prune()
+
+    def put(self, user_id: int, language: str, code: str) -> int:
+        """Queue a submission and return its position in the queue (1 is the next one)."""
+        self.connection.execute("DELETE FROM submissions WHERE status = 'pending' AND user_id = ? AND language = ?", (user_id, language))
+        submission_id = self.connection.execute('INSERT INTO submissions (user_id, language, code, created_at) VALUES (?, ?, ?, ?)',
+                                                (user_id, language, code, datetime.now().isoformat())).lastrowid
+        return self.position(submission_id)
+
+    def position(self, submission_id: int) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM submissions WHERE status = 'pending' AND id <= ?", (submission_id,)).fetchone()[0]
+
+    def claim(self):
+        """Mark the next submission as running and return it, or None if there is nothing to run."""
+        row = self.connection.execute("""
+            SELECT id, user_id, language, code FROM submissions
+            WHERE status = 'pending' AND user_id NOT IN (SELECT user_id FROM submissions WHERE status = 'running')
+            ORDER BY id LIMIT 1
+        """).fetchone()
+        if row is None:
+            return None
+
+        self.connection.execute("UPDATE submissions SET status = 'running' WHERE id = ?", (row[0],))
+        return Submission(*row)
+
+    def finish(self, submission_id: int, status: str = 'done') -> None:
+        self.connection.execute('UPDATE submissions SET status = ?, code = ? WHERE id = ?', (status, '', submission_id))
+        self.prune()
+
+    def prune(self) -> None:
+        self.connection.execute("DELETE FROM submissions WHERE status NOT IN ('pending', 'running') AND created_at < ?",
+                                ((datetime.now() - FINISHED_RETENTION).isoformat(),))
+
+    def release(self, submission_id: int) -> None:
+        self.connection.execute("UPDATE submissions SET status = 'pending' WHERE id = ?", (submission_id,))
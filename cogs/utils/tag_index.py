@@ -0,0 +1,46 @@
+from difflib import SequenceMatcher
+
+
+def most_similar(name: str, candidates) -> (str, float):
+    """Return the candidate the most similar to name, and the similarity ratio (between 0 and 1)."""
+    similors = ((candidate, SequenceMatcher(None, candidate, name).ratio()) for candidate in candidates)
+    return max(similors, key=lambda couple: couple[1], default=(None, 0.0))
+
+
+class TagIndex:
+    """Lookups in the loaded tags : {category: {tag name: tag_model.Tag}}."""
+
+    def __init__(self, tags: dict):
+        self.tags = tags
+
+    def find_category(self, category: str):
+        """Return the category name (exact or close enough), or None."""
+        if category in self.tags:
+            return category
+        if category is None:
+            return None
+
+        similar, ratio = most_similar(category, self.tags.keys())
+        return similar if ratio > 0.8 else None
+
+    @staticmethod
+    def get_variant(tag, lang: str):
+        return tag.get_variant(lang)
+
+    def find_tag(self, category: str, query: str, lang: str) -> (str, object, str):
+        """
+        Return (tag name, tag, None) for the tag named query (or aliased, or close enough to its name),
+        or (None, None, suggestion) where suggestion is a tag name a bit similar to query, or None.
+        """
+        category_tags = self.tags[category]
+        if (tag := category_tags.get(query)) is not None:
+            return query, tag, None
+
+        for name, tag in category_tags.items():
+            if query in tag.get_variant(lang).aliases:
+                return query, tag, None
+
+        similar, ratio = most_similar(query, category_tags.keys())
+        if ratio > 0.8:
+            return similar, category_tags[similar], None
+        return None, None, similar if ratio > 0.5 else None
@@ -0,0 +1,176 @@
+import re
+from sys import intern
+
+RE_LANG = re.compile(r'[a-z]{2}_[A-Z]{2}')
+
+
+class TagError(ValueError):
+    """An improper tag file, the message gives the path of the faulty value (e.g. response.choices[1].embed.title)."""
+
+
+def complete_values(obj, ref=None):
+    """Replace the "*" values by the value at the same place in the first variant (or the first element of the list)."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if value == "*" and ref:
+                obj[key] = ref[key]
+            else:
+                obj[key] = complete_values(value, ref=ref[key] if ref else ref)
+    elif isinstance(obj, list) and all(isinstance(sub_obj, dict) for sub_obj in obj):
+        for i, sub_obj in enumerate(obj):
+            if i == 0 and not ref: continue
+            obj[i] = complete_values(obj[i], ref=ref[i] if ref else obj[0])
+
+    return obj
+
+
+def check_keys(data, path: str, required: tuple, optional: tuple = ()) -> None:
+    if not isinstance(data, dict):
+        raise TagError(f'{path} : expected an object, got {type(data).__name__}')
+    if missing := [key for key in required if key not in data]:
+        raise TagError(f'{path} : missing key {missing[0]!r}')
+    if unknown := [key for key in data if key not in required and key not in optional]:
+        raise TagError(f'{path} : unknown key {unknown[0]!r}')
+
+
+def check_str(value, path: str) -> str:
+    if not isinstance(value, str):
+        raise TagError(f'{path} : expected a string, got {type(value).__name__}')
+    return value
+
+
+def check_text(value, path: str) -> str:
+    """A string, or a list of lines."""
+    if isinstance(value, list) and all(isinstance(line, str) for line in value):
+        return '\n'.join(value)
+    return check_str(value, path)
+
+
+class Field:
+    __slots__ = ('name', 'value', 'inline')
+
+    def __init__(self, name: str, value: str, inline: bool = None):
+        self.name = name
+        self.value = value
+        self.inline = inline
+
+    @classmethod
+    def from_json(cls, data, path: str):
+        check_keys(data, path, ('name', 'value'), ('inline',))
+        if 'inline' in data and not isinstance(data['inline'], bool):
+            raise TagError(f'{path}.inline : expected a boolean')
+        return cls(intern(check_str(data['name'], f'{path}.name')), check_text(data['value'], f'{path}.value'), data.get('inline'))
+
+
+class Embed:
+    __slots__ = ('title', 'description', 'image_url', 'fields')
+
+    def __init__(self, title: str, description: str, image_url: str = None, fields: tuple = ()):
+        self.title = title
+        self.description = description
+        self.image_url = image_url
+        self.fields = fields
+
+    @classmethod
+    def from_json(cls, data, path: str):
+        check_keys(data, path, ('title', 'description'), ('image', 'fields'))
+        image_url = None
+        if 'image' in data:
+            check_keys(data['image'], f'{path}.image', ('url',))
+            image_url = check_str(data['image']['url'], f'{path}.image.url')
+        if not isinstance(fields := data.get('fields', []), list):
+            raise TagError(f'{path}.fields : expected a list')
+
+        return cls(
+            check_str(data['title'], f'{path}.title'),
+            check_text(data['description'], f'{path}.description'),
+            image_url,
+            tuple(Field.from_json(field, f'{path}.fields[{i}]') for i, field in enumerate(fields))
+        )
+
+    def to_dict(self) -> dict:
+        """For discord.Embed.from_dict, a new dict each time (discord.py keeps a reference to the fields)."""
+        data = {'title': self.title, 'description': self.description}
+        if self.image_url is not None:
+            data['image'] = {'url': self.image_url}
+        if self.fields:
+            data['fields'] = [{'name': field.name, 'value': field.value} if field.inline is None else
+                              {'name': field.name, 'value': field.value, 'inline': field.inline} for field in self.fields]
+        return data
+
+
+class Choice:
+    __slots__ = ('name', 'embed')
+
+    def __init__(self, name: str, embed: Embed):
+        self.name = name
+        self.embed = embed
+
+    @classmethod
+    def from_json(cls, data, path: str):
+        check_keys(data, path, ('choice_name', 'embed'))
+        return cls(intern(check_str(data['choice_name'], f'{path}.choice_name')), Embed.from_json(data['embed'], f'{path}.embed'))
+
+
+class Variant:
+    """A tag in one language, the response is an embed or a list of choices (one embed per choice)."""
+    __slots__ = ('lang', 'name', 'aliases', 'description', 'embed', 'choices')
+
+    def __init__(self, name: str, description: str, *, lang: str = None, aliases: tuple = (), embed: Embed = None, choices: tuple = ()):
+        self.lang = lang
+        self.name = name
+        self.aliases = aliases
+        self.description = description
+        self.embed = embed
+        self.choices = choices
+
+    @classmethod
+    def from_json(cls, data, path: str):
+        check_keys(data, path, ('name', 'description', 'response'), ('lang', 'aliases'))
+        lang = data.get('lang')
+        if lang is not None and not (isinstance(lang, str) and RE_LANG.search(lang)):
+            raise TagError(f'{path}.lang : expected a language like en_EN, got {lang!r}')
+        if not isinstance(aliases := data.get('aliases', []), list):
+            raise TagError(f'{path}.aliases : expected a list')
+
+        response = data['response']
+        embed, choices = None, ()
+        if isinstance(response, dict) and 'choices' in response:
+            check_keys(response, f'{path}.response', ('choices',))
+            if not isinstance(response['choices'], list):
+                raise TagError(f'{path}.response.choices : expected a list')
+            choices = tuple(Choice.from_json(choice, f'{path}.response.choices[{i}]') for i, choice in enumerate(response['choices']))
+        else:
+            check_keys(response, f'{path}.response', ('embed',))
+            embed = Embed.from_json(response['embed'], f'{path}.response.embed')
+
+        return cls(
+            intern(check_str(data['name'], f'{path}.name')),
+            check_str(data['description'], f'{path}.description'),
+            lang=intern(lang) if lang else None,
+            aliases=tuple(intern(alias) if isinstance(alias, str) else alias for alias in aliases),
+            embed=embed,
+            choices=choices
+        )
+
+
+class Tag:
+    """The variants of a tag, one per language, the first one is the default."""
+    __slots__ = ('name', 'variants')
+
+    def __init__(self, variants: tuple):
+        self.name = variants[0].name
+        self.variants = variants
+
+    @classmethod
+    def from_json(cls, data):
+        """Validate a tag file (a variant or a list of variants) and build the tag, raise TagError if it is improper."""
+        data = complete_values(data)
+        if isinstance(data, list):
+            if not data:
+                raise TagError('expected at least one variant')
+            return cls(tuple(Variant.from_json(variant, f'[{i}]') for i, variant in enumerate(data)))
+        return cls((Variant.from_json(data, 'tag'),))
+
+    def get_variant(self, lang: str) -> Variant:
+        return next((variant for variant in self.variants if variant.lang == lang), self.variants[0])
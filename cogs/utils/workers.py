@@ -0,0 +1,79 @@
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import time
+from typing import Callable, TypeVar
+
+from . import metrics, custom_errors
+
+T = TypeVar('T')
+
+worker_jobs = metrics.counter('worker_jobs_total', 'Jobs given to the worker processes, by job and result.', ('job', 'result'))
+worker_duration = metrics.histogram('worker_job_seconds', 'Time to get the result of a job (queue included), by job.', ('job',))
+
+
+def mp_context():
+    if 'forkserver' not in multiprocessing.get_all_start_methods():  # Windows
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')  # not fork : the workers don't inherit the event loop and the threads
+    context.set_forkserver_preload(['cogs.utils.jobs'])  # imported once by the fork server, the workers are forked from it
+    return context  # the workers also import __main__ : main.py only imports the bot in main()
+
+
+class WorkerPool:
+    """
+    Run the CPU-bound jobs (cogs/utils/jobs.py) in worker processes, so they don't hold the GIL while the gateway
+    needs the event loop. At most `max_pending` jobs are queued or running, the next ones are rejected (WorkersBusy).
+    """
+
+    def __init__(self, *, processes: int = None, max_pending: int = None, timeout: float = 30):
+        self.processes = processes or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.processes * 4
+        self.timeout = timeout
+        self.pending = 0  # a job counts until it is really finished, also after a timeout
+        self.pending_lock = threading.Lock()  # the jobs are released from the executor thread
+        self.executor = None  # started with the first job
+
+    def release(self, __) -> None:
+        with self.pending_lock:
+            self.pending -= 1
+
+    async def run(self, job: Callable[..., T], *args, timeout: float = None) -> T:
+        """
+        Return job(*args), computed by a worker. Raise WorkerTimeout after `timeout` seconds : the job is dropped
+        if it is still queued, a running job can't be interrupted, it finishes in its worker and counts as pending until then.
+        """
+        if self.pending >= self.max_pending:
+            worker_jobs.inc(job.__name__, 'rejected')
+            raise custom_errors.WorkersBusy()
+        if self.executor is None:
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.processes, mp_context=mp_context())
+
+        start = time.perf_counter()
+        try:
+            future = self.executor.submit(job, *args)
+            with self.pending_lock:
+                self.pending += 1
+            future.add_done_callback(self.release)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            worker_jobs.inc(job.__name__, 'timeout')
+            raise custom_errors.WorkerTimeout() from None
+        except concurrent.futures.process.BrokenProcessPool:  # a worker was killed (out of memory...), a new pool is started for the next job
+            self.close()
+            worker_jobs.inc(job.__name__, 'error')
+            raise
+        except Exception:
+            worker_jobs.inc(job.__name__, 'error')
+            raise
+
+        worker_jobs.inc(job.__name__, 'ok')
+        worker_duration.observe(time.perf_counter() - start, job.__name__)
+        return result
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -1,42 +1,123 @@
 import argparse
+import asyncio
 import json
 import os
 
-import requests
+import aiohttp
 import dotenv
 
 dotenv.load_dotenv()
 
+COMMANDS_FOLDER = "ressources/slash_commands/"
+TAGS_FOLDER = "ressources/tags/"
+COMMAND_DEFAULTS = {"type": 1, "default_permission": True}
+OPTION_DEFAULTS = {"required": False}
+
 parser = argparse.ArgumentParser()
-parser.add_argument("name")
-parser.add_argument("--guild", required=False, help="Permet de spécifier un serveur.")
+parser.add_argument("name", nargs="?", help="La commande à créer, mettre à jour ou supprimer.")
+parser.add_argument("--guild", action="append", default=[], help="Permet de spécifier un serveur (plusieurs avec --sync).")
 parser.add_argument("--update", required=False, action="store_true", help="Permet de mettre à jour la commande.")
 parser.add_argument("--delete", required=False, action="store_true", help="Permet de supprimer la commande.")
-args = parser.parse_args()
-
-try:
-    with open(f"ressources/slash_commands/{args.name}.json", "r", encoding="utf-8") as f:
-        json_command = json.load(f)
-except FileNotFoundError:
-    print("La commande n'a pas été trouvée")
-else:
-    headers = {
-        "Authorization": f"Bot {os.getenv('BOT_TOKEN')}"
-    }
-
-    url = f"https://discord.com/api/v8/applications/{os.getenv('CLIENT_ID')}{'/guilds/'+args.guild if args.guild else ''}/commands"
-    method = "POST"
-
-    if args.update or args.delete:
-        r = requests.get(url, headers=headers)
+parser.add_argument("--sync", action="store_true", help="Synchronise toutes les commandes, seuls les serveurs modifiés sont mis à jour.")
+parser.add_argument("--dry-run", action="store_true", help="Avec --sync, affiche les différences sans rien envoyer.")
+parser.add_argument("--api", default=os.getenv("DISCORD_API_URL", "https://discord.com/api/v8"), help="URL de l'API (une fausse API pour tester).")
+
+
+def load_command(name: str) -> dict:
+    with open(os.path.join(COMMANDS_FOLDER, f"{name}.json"), "r", encoding="utf-8") as f:
+        command = json.load(f)
+
+    if name == "tag":  # the categories are the folders of the tags, not maintained by hand
+        category = next(option for option in command["options"] if option["name"] == "category")
+        category["choices"] = [{"name": category_name, "value": category_name}
+                               for category_name in sorted(os.listdir(TAGS_FOLDER)) if os.path.isdir(os.path.join(TAGS_FOLDER, category_name))]
+    return command
+
+
+def load_commands() -> list:
+    return [load_command(os.path.splitext(file_name)[0]) for file_name in sorted(os.listdir(COMMANDS_FOLDER)) if file_name.endswith(".json")]
+
+
+def normalize(obj: dict, defaults: dict = COMMAND_DEFAULTS) -> dict:
+    """Discord adds ids and default values to the registered commands, keep what the command files define."""
+    normalized = {key: obj.get(key, default) for key, default in defaults.items()}
+    for key in ("name", "description", "type", "choices"):
+        if obj.get(key) is not None:
+            normalized[key] = obj[key]
+    if obj.get("options"):
+        normalized["options"] = [normalize(option, OPTION_DEFAULTS) for option in obj["options"]]
+    return normalized
+
+
+def diff(registered: list, commands: list) -> list:
+    """Return the lines describing the differences, empty if the registered commands are up to date."""
+    registered = {command["name"]: normalize(command) for command in registered}
+    commands = {command["name"]: normalize(command) for command in commands}
+
+    lines = [f"  + {name}" for name in commands.keys() - registered.keys()]
+    lines += [f"  - {name}" for name in registered.keys() - commands.keys()]
+    lines += [f"  ~ {name}" for name in commands.keys() & registered.keys() if commands[name] != registered[name]]
+    return sorted(lines)
+
+
+async def sync(session: aiohttp.ClientSession, url: str, commands: list, label: str, dry_run: bool) -> bool:
+    async with session.get(url) as response:
+        response.raise_for_status()
+        registered = await response.json()
+
+    if not (changes := diff(registered, commands)):
+        print(f"{label} : à jour.")
+        return True
+
+    print(f"{label} :\n" + "\n".join(changes))
+    if dry_run:
+        return True
+
+    async with session.put(url, json=commands) as response:  # bulk overwrite, the unchanged commands keep their id
+        if response.status != 200:
+            print(f"{label} : erreur {response.status}\n{await response.text()}")
+            return False
+    print(f"{label} : mis à jour.")
+    return True
+
+
+async def main(args):
+    headers = {"Authorization": f"Bot {os.getenv('BOT_TOKEN')}"}
+    base_url = f"{args.api}/applications/{os.getenv('CLIENT_ID')}"
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        if args.sync:
+            commands = load_commands()
+            scopes = [(f"{base_url}/guilds/{guild}/commands", f"Serveur {guild}") for guild in args.guild] or [(f"{base_url}/commands", "Global")]
+            results = await asyncio.gather(*(sync(session, url, commands, label, args.dry_run) for url, label in scopes))
+            return all(results)
+
         try:
-            command = (cmd for cmd in r.json() if cmd.get('name') == args.name).__next__()
-        except StopIteration:
-            print("Cette commande n'existe pas encore.")
-            exit()
-        else:
-            url += '/'+command['id']
+            json_command = load_command(args.name)
+        except FileNotFoundError:
+            print("La commande n'a pas été trouvée")
+            return False
+
+        url = f"{base_url}{'/guilds/' + args.guild[0] if args.guild else ''}/commands"
+        method = "POST"
+
+        if args.update or args.delete:
+            async with session.get(url) as response:
+                command = next((cmd for cmd in await response.json() if cmd.get('name') == args.name), None)
+            if command is None:
+                print("Cette commande n'existe pas encore.")
+                return False
+            url += '/' + command['id']
             method = "PATCH" if args.update else "DELETE"
 
-    r = requests.request(method, url, headers=headers, json=json_command)
-    print(r.content if r.status_code != 200 else "Effectué avec succès !")
+        async with session.request(method, url, json=json_command if method != "DELETE" else None) as response:
+            print(await response.text() if response.status not in (200, 201, 204) else "Effectué avec succès !")
+            return response.status in (200, 201, 204)
+
+
+if __name__ == "__main__":
+    arguments = parser.parse_args()
+    if not arguments.sync and not arguments.name:
+        parser.error("le nom de la commande est requis (ou --sync)")
+    success = asyncio.get_event_loop().run_until_complete(main(arguments))
+    raise SystemExit(0 if success else 1)